@@ -5,109 +5,115 @@ Keeps only the card with the most complete data (category rewards, etc.)
 from supabase import create_client
 import os
 from dotenv import load_dotenv
-from collections import defaultdict
+from functools import lru_cache
 import re
+import pandas as pd
 
 load_dotenv(override=True)
 
+# Max card ids per DELETE request; 200 UUIDs keep the in.(...) query string under ~8 KB URL limits
+DELETE_BATCH_SIZE = 200
+
 client = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
 
 print("=" * 60)
 print("ADVANCED CARD DEDUPLICATION")
 print("=" * 60)
 
-# Get all cards
-all_cards = client.table('cards').select('*').execute()
+# Get all cards with their category reward counts in one read (see card_dedup_v in schema.sql)
+all_cards = client.table('card_dedup_v').select(
+    'id, card_key, name, issuer, annual_fee, base_reward_rate, reward_count'
+).execute()
 print(f"\nTotal cards: {len(all_cards.data)}")
 
-# Get category rewards for each card
-category_rewards = client.table('category_rewards').select('card_id').execute()
-cards_with_rewards = {}
-for cr in category_rewards.data:
-    card_id = cr['card_id']
-    cards_with_rewards[card_id] = cards_with_rewards.get(card_id, 0) + 1
+# Patterns used by normalize_card_name, compiled once for the whole run
+SPECIAL_CHARS_RE = re.compile(r'[®™*©]')
+WHITESPACE_RE = re.compile(r'\s+')
+# Common noise words, longest first so "perks of the" wins over "perks of"
+NOISE_WORDS = [
+    'card', 'credit', 'mastercard', 'visa', 'american express',
+    'best', 'perks of the', 'perks of', 'the', 'a', 'an',
+    'for', 'with', 'from',
+]
+NOISE_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(w) for w in sorted(NOISE_WORDS, key=len, reverse=True)) + r')\b|:'
+)
 
+@lru_cache(maxsize=None)
 def normalize_card_name(name, issuer):
     """Aggressively normalize card name for comparison"""
     # Combine issuer and name
     full_name = f"{issuer} {name}".lower()
     
-    # Remove all special characters and extra words
-    full_name = re.sub(r'[®™*©]', '', full_name)
-    full_name = re.sub(r'\s+', ' ', full_name)
-    
-    # Remove common noise words
-    noise_words = [
-        'card', 'credit', 'mastercard', 'visa', 'american express',
-        'best', 'perks of the', 'perks of', 'the', 'a', 'an',
-        'for', 'with', 'from', ':'
-    ]
-    for word in noise_words:
-        full_name = full_name.replace(word, '')
+    # Remove special characters (only '*' among them is ASCII, so most names skip this)
+    if not full_name.isascii() or '*' in full_name:
+        full_name = SPECIAL_CHARS_RE.sub('', full_name)
     
-    # Remove extra spaces
-    full_name = ' '.join(full_name.split())
+    # Remove common noise words in one pass
+    full_name = NOISE_RE.sub('', full_name)
     
-    return full_name.strip()
+    # Collapse extra spaces
+    return WHITESPACE_RE.sub(' ', full_name).strip()
 
-# Group cards by normalized name
-card_groups = defaultdict(list)
+# Group cards by normalized name, noting groups as soon as they gain a second card
+card_groups = {}
+duplicate_groups = {}
 for card in all_cards.data:
     normalized = normalize_card_name(card['name'], card['issuer'])
-    card_groups[normalized].append(card)
+    group = card_groups.setdefault(normalized, [])
+    group.append(card)
+    if len(group) == 2:
+        duplicate_groups[normalized] = group
 
 print(f"\nUnique card names after normalization: {len(card_groups)}")
 
-# Find and score duplicates
+# Score every card in one vectorized pass (higher is better)
+cards_df = pd.DataFrame(
+    all_cards.data,
+    columns=['id', 'card_key', 'name', 'issuer', 'annual_fee', 'base_reward_rate', 'reward_count'],
+)
+scores = (
+    # Has category rewards? +100 per reward
+    cards_df['reward_count'].fillna(0) * 100
+    # Shorter card_key (cleaner) +50
+    + (cards_df['card_key'].str.len() < 50) * 50
+    # Has annual fee data +20
+    + (cards_df['annual_fee'].fillna(-1) >= 0) * 20
+    # Base reward rate > 0 +10
+    + (cards_df['base_reward_rate'].fillna(0) > 0) * 10
+    # Prefer cards without "best", "perks" in key -50
+    - cards_df['card_key'].str.contains('best-|perks-', regex=True) * 50
+)
+card_scores = dict(zip(cards_df['id'], scores.astype(int)))
+
+# Find duplicates
 duplicates_found = 0
 cards_to_delete = []
 
-for norm_name, cards in card_groups.items():
-    if len(cards) > 1:
-        duplicates_found += len(cards) - 1
-        
-        print(f"\n{'='*60}")
-        print(f"Duplicate group: {norm_name}")
-        print(f"Found {len(cards)} versions:")
-        
-        # Score each card
-        scored_cards = []
-        for card in cards:
-            score = 0
-            
-            # Has category rewards? +100 per reward
-            reward_count = cards_with_rewards.get(card['id'], 0)
-            score += reward_count * 100
-            
-            # Shorter card_key (cleaner) +50
-            if len(card['card_key']) < 50:
-                score += 50
-            
-            # Has annual fee data +20
-            if card['annual_fee'] is not None and card['annual_fee'] >= 0:
-                score += 20
-            
-            # Base reward rate > 0 +10
-            if card['base_reward_rate'] and card['base_reward_rate'] > 0:
-                score += 10
-            
-            # Prefer cards without "best", "perks" in key -50
-            if any(word in card['card_key'] for word in ['best-', 'perks-']):
-                score -= 50
-            
-            scored_cards.append((score, card))
-            print(f"  [{score:4d}] {card['name'][:50]} ({card['card_key'][:40]})")
-        
-        # Sort by score (highest first)
-        scored_cards.sort(reverse=True, key=lambda x: x[0])
-        
-        # Keep the best one, delete the rest
-        best_card = scored_cards[0][1]
-        print(f"\n  ✓ KEEPING: {best_card['name'][:50]}")
-        
-        for score, card in scored_cards[1:]:
-            cards_to_delete.append(card)
-            print(f"  ✗ DELETING: {card['name'][:50]}")
+for norm_name, cards in duplicate_groups.items():
+    duplicates_found += len(cards) - 1
+    
+    print(f"\n{'='*60}")
+    print(f"Duplicate group: {norm_name}")
+    print(f"Found {len(cards)} versions:")
+    
+    # Look up precomputed scores
+    scored_cards = []
+    for card in cards:
+        score = card_scores[card['id']]
+        scored_cards.append((score, card))
+        print(f"  [{score:4d}] {card['name'][:50]} ({card['card_key'][:40]})")
+    
+    # Sort by score (highest first)
+    scored_cards.sort(reverse=True, key=lambda x: x[0])
+    
+    # Keep the best one, delete the rest
+    best_card = scored_cards[0][1]
+    print(f"\n  ✓ KEEPING: {best_card['name'][:50]}")
+    
+    for score, card in scored_cards[1:]:
+        cards_to_delete.append(card)
+        print(f"  ✗ DELETING: {card['name'][:50]}")
 
 print(f"\n" + "=" * 60)
 print(f"Summary:")
@@ -125,17 +131,16 @@ if cards_to_delete:
     if confirm.lower() == 'yes':
         print("\nDeleting duplicates...")
         deleted_count = 0
-        for card in cards_to_delete:
+        delete_ids = [card['id'] for card in cards_to_delete]
+        # Delete in batches with PostgREST's in.(...) filter, small enough to stay under URL limits
+        for i in range(0, len(delete_ids), DELETE_BATCH_SIZE):
+            batch = delete_ids[i:i + DELETE_BATCH_SIZE]
             try:
-                # Delete category rewards first
-                client.table('category_rewards').delete().eq('card_id', card['id']).execute()
-                # Delete signup bonuses
-                client.table('signup_bonuses').delete().eq('card_id', card['id']).execute()
-                # Delete card
-                client.table('cards').delete().eq('id', card['id']).execute()
-                deleted_count += 1
+                # Category rewards and signup bonuses cascade (see schema.sql)
+                client.table('cards').delete().in_('id', batch).execute()
+                deleted_count += len(batch)
             except Exception as e:
-                print(f"  Error deleting {card['name']}: {e}")
+                print(f"  Error deleting batch of {len(batch)} cards: {e}")
         
         print(f"\n✓ Successfully deleted {deleted_count} duplicate cards")
         
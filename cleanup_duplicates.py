@@ -8,31 +8,42 @@ from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
+# Max card ids per DELETE request; 200 UUIDs keep the in.(...) query string under ~8 KB URL limits
+DELETE_BATCH_SIZE = 200
+# Rows per page when reading category_rewards
+PAGE_SIZE = 1000
+
 client = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
 
 # Get all cards
 all_cards = client.table('cards').select('id, card_key, name').execute()
 print(f"Total cards before cleanup: {len(all_cards.data)}")
 
-# Get cards that have category rewards
-cards_with_rewards = client.table('category_rewards').select('card_id').execute()
-card_ids_with_rewards = set(r['card_id'] for r in cards_with_rewards.data)
+# Get cards that have category rewards, one page at a time so memory stays bounded
+card_ids_with_rewards = set()
+offset = 0
+while True:
+    page = (
+        client.table('category_rewards').select('card_id')
+        .order('id').range(offset, offset + PAGE_SIZE - 1).execute()
+    )
+    card_ids_with_rewards.update(r['card_id'] for r in page.data)
+    if len(page.data) < PAGE_SIZE:
+        break
+    offset += PAGE_SIZE
 print(f"Cards with category rewards: {len(card_ids_with_rewards)}")
 
 # Find cards to delete (no category rewards)
-cards_to_delete = []
-for card in all_cards.data:
-    if card['id'] not in card_ids_with_rewards:
-        cards_to_delete.append(card)
+ids_to_delete = list({c['id'] for c in all_cards.data} - card_ids_with_rewards)
 
-print(f"Cards to delete (no rewards): {len(cards_to_delete)}")
+print(f"Cards to delete (no rewards): {len(ids_to_delete)}")
 
-# Delete cards without rewards
-if cards_to_delete:
+# Delete cards without rewards, in batches small enough to stay under URL limits
+if ids_to_delete:
     print("\nDeleting cards without category rewards...")
-    for card in cards_to_delete:
-        client.table('cards').delete().eq('id', card['id']).execute()
-    print(f"Deleted {len(cards_to_delete)} cards")
+    for i in range(0, len(ids_to_delete), DELETE_BATCH_SIZE):
+        client.table('cards').delete().in_('id', ids_to_delete[i:i + DELETE_BATCH_SIZE]).execute()
+    print(f"Deleted {len(ids_to_delete)} cards")
 
 # Verify
 remaining = client.table('cards').select('id', count='exact').execute()
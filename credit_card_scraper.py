@@ -3,15 +3,53 @@ Credit Card Scraper - Scrapes Canadian credit card information for the Rewards O
 Populates the Supabase database with card data, category rewards, and signup bonuses.
 """
 
-import requests
+import httpx
 from bs4 import BeautifulSoup
-import json
-import time
+import orjson
 import re
+import threading
+import time
+from urllib.parse import urlparse
 from datetime import datetime
 from typing import Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+
+# Max concurrent page fetches per source
+MAX_FETCH_WORKERS = 4
+
+# Fee and reward rate parsing patterns, shared across all parse calls
+FEE_AMOUNT_RE = re.compile(r'\$?([\d,]+(?:\.\d{2})?)')
+FEE_LABEL_RE = re.compile(r'annual fee|yearly fee', re.I)
+MULTIPLIER_RATE_RE = re.compile(r'([\d.]+)\s*x')
+PERCENT_RATE_RE = re.compile(r'([\d.]+)\s*%')
+NUMBER_RE = re.compile(r'([\d.]+)')
+
+# Card keys keep only [a-z0-9], whitespace and dashes; ASCII input is filtered with
+# str.translate and the regex is only needed for the rare non-ASCII name
+CARD_KEY_INVALID_RE = re.compile(r'[^a-z0-9\s-]')
+CARD_KEY_ASCII_TABLE = str.maketrans(
+    {chr(c): None for c in range(128) if CARD_KEY_INVALID_RE.match(chr(c))}
+)
+CARD_KEY_SEPARATOR_RE = re.compile(r'[\s-]+')
+
+# CSS selectors for Ratehub listings; [class*=...] keeps the old substring-match semantics
+# while letting soupsieve compile each selector once instead of running a regex per node
+RATEHUB_CARD_SELECTOR = 'div[class*="card-listing"], div[class*="product-card"]'
+RATEHUB_HEADING_SELECTOR = ', '.join(
+    f'{tag}[class*="{cls}"]' for tag in ('h2', 'h3', 'h4') for cls in ('card-name', 'title')
+)
+RATEHUB_LINK_SELECTOR = 'a[class*="card-name"], a[class*="title"]'
+
+
+def _is_plain_number(text: str, allow_decimal: bool = True) -> bool:
+    """Check whether text is just ASCII digits (and optionally one decimal point)."""
+    if allow_decimal:
+        text = text.replace('.', '', 1)
+    return text.isascii() and text.isdigit()
 
 
 class RewardCurrency(Enum):
@@ -76,6 +114,111 @@ class CreditCard:
             self.category_rewards = []
 
 
+# Enum values used on per-card paths, resolved once instead of on every call
+CATEGORY_OTHER = SpendingCategory.OTHER.value
+CURRENCY_CASHBACK = RewardCurrency.CASHBACK.value
+CURRENCY_POINTS = RewardCurrency.POINTS.value
+CURRENCY_AIRLINE_MILES = RewardCurrency.AIRLINE_MILES.value
+CURRENCY_HOTEL_POINTS = RewardCurrency.HOTEL_POINTS.value
+
+
+class KeywordMatcher:
+    """
+    Finds the highest-priority keyword contained in a text with a single regex scan.
+    
+    Equivalent to checking `keyword in text` for each keyword in order and returning
+    the first hit, but all keywords are compiled into one alternation. Each keyword is
+    wrapped in its own group inside a lookahead, so every position of the text reports
+    the best keyword starting there and overlapping keywords are never skipped.
+    """
+
+    def __init__(self, keywords: list[tuple[str, str]]):
+        """
+        Args:
+            keywords: (keyword, value) pairs in priority order
+        """
+        self.values = [value for _, value in keywords]
+        alternatives = '|'.join(f'({re.escape(keyword)})' for keyword, _ in keywords)
+        self.pattern = re.compile(f'(?={alternatives})')
+
+    def match(self, text: str, default: str) -> str:
+        """Return the value of the highest-priority keyword found in text, or default."""
+        best = None
+        for match in self.pattern.finditer(text):
+            if best is None or match.lastindex < best:
+                best = match.lastindex
+                if best == 1:
+                    break
+        return self.values[best - 1] if best else default
+
+
+CATEGORY_MATCHER = KeywordMatcher([
+    ('grocery', SpendingCategory.GROCERIES.value),
+    ('groceries', SpendingCategory.GROCERIES.value),
+    ('supermarket', SpendingCategory.GROCERIES.value),
+    ('food', SpendingCategory.GROCERIES.value),
+    ('dining', SpendingCategory.DINING.value),
+    ('restaurant', SpendingCategory.DINING.value),
+    ('restaurants', SpendingCategory.DINING.value),
+    ('eat', SpendingCategory.DINING.value),
+    ('gas', SpendingCategory.GAS.value),
+    ('fuel', SpendingCategory.GAS.value),
+    ('petrol', SpendingCategory.GAS.value),
+    ('travel', SpendingCategory.TRAVEL.value),
+    ('hotel', SpendingCategory.TRAVEL.value),
+    ('flight', SpendingCategory.TRAVEL.value),
+    ('airline', SpendingCategory.TRAVEL.value),
+    ('online', SpendingCategory.ONLINE_SHOPPING.value),
+    ('amazon', SpendingCategory.ONLINE_SHOPPING.value),
+    ('entertainment', SpendingCategory.ENTERTAINMENT.value),
+    ('movie', SpendingCategory.ENTERTAINMENT.value),
+    ('streaming', SpendingCategory.ENTERTAINMENT.value),
+    ('drugstore', SpendingCategory.DRUGSTORES.value),
+    ('pharmacy', SpendingCategory.DRUGSTORES.value),
+    ('drug', SpendingCategory.DRUGSTORES.value),
+    ('home', SpendingCategory.HOME_IMPROVEMENT.value),
+    ('hardware', SpendingCategory.HOME_IMPROVEMENT.value),
+    ('transit', SpendingCategory.OTHER.value),
+    ('recurring', SpendingCategory.OTHER.value),
+])
+
+ISSUER_MATCHER = KeywordMatcher([
+    ('td ', 'TD'), ('td-', 'TD'),
+    ('rbc ', 'RBC'), ('royal bank', 'RBC'),
+    ('bmo ', 'BMO'),
+    ('cibc ', 'CIBC'),
+    ('scotiabank', 'Scotiabank'), ('scotia ', 'Scotiabank'),
+    ('amex', 'American Express'), ('american express', 'American Express'),
+    ('mbna ', 'MBNA'),
+    ('capital one', 'Capital One'),
+    ('tangerine', 'Tangerine'),
+    ('simplii', 'Simplii'),
+    ('pc ', 'PC Financial'), ('president', 'PC Financial'),
+    ('hsbc', 'HSBC'),
+    ('national bank', 'National Bank'),
+    ('desjardins', 'Desjardins'),
+])
+
+REWARD_PROGRAM_MATCHER = KeywordMatcher([
+    ('aeroplan', 'Aeroplan'),
+    ('scene', 'Scene+'),
+    ('air miles', 'Air Miles'),
+    ('avion', 'Avion'),
+    ('td rewards', 'TD Rewards'), ('td first class', 'TD Rewards'),
+    ('bmo rewards', 'BMO Rewards'),
+    ('aventura', 'Aventura'),
+    ('membership rewards', 'Membership Rewards'), ('amex', 'Membership Rewards'),
+    ('cobalt', 'Membership Rewards'), ('gold rewards', 'Membership Rewards'),
+    ('platinum', 'Membership Rewards'),
+    ('cash back', 'Cashback'), ('cashback', 'Cashback'), ('cash-back', 'Cashback'),
+    ('pc optimum', 'PC Optimum'), ('pc financial', 'PC Optimum'),
+    ('triangle', 'Triangle Rewards'),
+    ('marriott', 'Marriott Bonvoy'), ('bonvoy', 'Marriott Bonvoy'),
+    ('hilton', 'Hilton Honors'),
+    ('westjet', 'WestJet Rewards'),
+])
+
+
 class CreditCardScraper:
     """Scrapes Canadian credit card information from various sources."""
 
@@ -87,17 +230,23 @@ class CreditCardScraper:
             'Accept-Language': 'en-CA,en;q=0.9,fr-CA;q=0.8',
         }
         self.cards: list[CreditCard] = []
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        # host -> Semaphore(1); concurrent fetches to the same site wait self.delay between requests
+        self._host_locks: dict[str, threading.Semaphore] = {}
+        # HTTP/2 client with a keep-alive pool shared by the concurrent page fetches
+        self.session = httpx.Client(
+            http2=True,
+            headers=self.headers,
+            timeout=15.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=MAX_FETCH_WORKERS),
+        )
 
     def _generate_card_key(self, name: str, issuer: str) -> str:
         """Generate a unique card key from name and issuer."""
-        combined = f"{issuer}-{name}"
-        key = combined.lower()
-        key = re.sub(r'[^a-z0-9\s-]', '', key)
-        key = re.sub(r'\s+', '-', key)
-        key = re.sub(r'-+', '-', key)
-        return key.strip('-')
+        key = f"{issuer}-{name}".lower().translate(CARD_KEY_ASCII_TABLE)
+        if not key.isascii():
+            key = CARD_KEY_INVALID_RE.sub('', key)
+        return CARD_KEY_SEPARATOR_RE.sub('-', key).strip('-')
 
     def _parse_annual_fee(self, fee_text: str) -> float:
         """Parse annual fee from text like '$139' or 'No annual fee'."""
@@ -106,7 +255,12 @@ class CreditCardScraper:
         fee_text = fee_text.lower().strip()
         if 'no' in fee_text or 'free' in fee_text or fee_text == '$0':
             return 0.0
-        match = re.search(r'\$?([\d,]+(?:\.\d{2})?)', fee_text)
+        # Fast path for plain amounts like "$139" or "1,200"
+        amount = fee_text[1:] if fee_text.startswith('$') else fee_text
+        amount = amount.replace(',', '')
+        if _is_plain_number(amount, allow_decimal=False):
+            return float(amount)
+        match = FEE_AMOUNT_RE.search(fee_text)
         if match:
             return float(match.group(1).replace(',', ''))
         return 0.0
@@ -116,16 +270,19 @@ class CreditCardScraper:
         if not rate_text:
             return (1.0, "percent")
         rate_text = rate_text.lower().strip()
+        # Fast path for bare rates like "5%" or "1.5x"
+        if rate_text[-1:] in ('%', 'x') and _is_plain_number(rate_text[:-1]):
+            return (float(rate_text[:-1]), "percent" if rate_text[-1] == '%' else "multiplier")
         # Check for multiplier (e.g., "5x")
-        match = re.search(r'([\d.]+)\s*x', rate_text)
+        match = MULTIPLIER_RATE_RE.search(rate_text)
         if match:
             return (float(match.group(1)), "multiplier")
         # Check for percentage (e.g., "5%")
-        match = re.search(r'([\d.]+)\s*%', rate_text)
+        match = PERCENT_RATE_RE.search(rate_text)
         if match:
             return (float(match.group(1)), "percent")
         # Try to find any number
-        match = re.search(r'([\d.]+)', rate_text)
+        match = NUMBER_RE.search(rate_text)
         if match:
             return (float(match.group(1)), "percent")
         return (1.0, "percent")
@@ -133,40 +290,7 @@ class CreditCardScraper:
 
     def _map_category(self, category_text: str) -> str:
         """Map category text to SpendingCategory enum value."""
-        category_text = category_text.lower()
-        mappings = {
-            'grocery': SpendingCategory.GROCERIES.value,
-            'groceries': SpendingCategory.GROCERIES.value,
-            'supermarket': SpendingCategory.GROCERIES.value,
-            'food': SpendingCategory.GROCERIES.value,
-            'dining': SpendingCategory.DINING.value,
-            'restaurant': SpendingCategory.DINING.value,
-            'restaurants': SpendingCategory.DINING.value,
-            'eat': SpendingCategory.DINING.value,
-            'gas': SpendingCategory.GAS.value,
-            'fuel': SpendingCategory.GAS.value,
-            'petrol': SpendingCategory.GAS.value,
-            'travel': SpendingCategory.TRAVEL.value,
-            'hotel': SpendingCategory.TRAVEL.value,
-            'flight': SpendingCategory.TRAVEL.value,
-            'airline': SpendingCategory.TRAVEL.value,
-            'online': SpendingCategory.ONLINE_SHOPPING.value,
-            'amazon': SpendingCategory.ONLINE_SHOPPING.value,
-            'entertainment': SpendingCategory.ENTERTAINMENT.value,
-            'movie': SpendingCategory.ENTERTAINMENT.value,
-            'streaming': SpendingCategory.ENTERTAINMENT.value,
-            'drugstore': SpendingCategory.DRUGSTORES.value,
-            'pharmacy': SpendingCategory.DRUGSTORES.value,
-            'drug': SpendingCategory.DRUGSTORES.value,
-            'home': SpendingCategory.HOME_IMPROVEMENT.value,
-            'hardware': SpendingCategory.HOME_IMPROVEMENT.value,
-            'transit': SpendingCategory.OTHER.value,
-            'recurring': SpendingCategory.OTHER.value,
-        }
-        for key, value in mappings.items():
-            if key in category_text:
-                return value
-        return SpendingCategory.OTHER.value
+        return CATEGORY_MATCHER.match(category_text.lower(), CATEGORY_OTHER)
 
     def _determine_reward_currency(self, program: str, card_name: str) -> str:
         """Determine reward currency based on program name."""
@@ -174,18 +298,18 @@ class CreditCardScraper:
         name_lower = card_name.lower()
         
         if any(x in program_lower for x in ['aeroplan', 'air miles', 'avion', 'westjet']):
-            return RewardCurrency.AIRLINE_MILES.value
+            return CURRENCY_AIRLINE_MILES
         if any(x in program_lower for x in ['marriott', 'hilton', 'bonvoy']):
-            return RewardCurrency.HOTEL_POINTS.value
+            return CURRENCY_HOTEL_POINTS
         if any(x in program_lower or x in name_lower for x in ['cash', 'cashback', 'cash back']):
-            return RewardCurrency.CASHBACK.value
-        return RewardCurrency.POINTS.value
+            return CURRENCY_CASHBACK
+        return CURRENCY_POINTS
 
     def _estimate_point_value(self, reward_currency: str, program: str) -> float:
         """Estimate point value in CAD cents based on program."""
         program_lower = program.lower()
         
-        if reward_currency == RewardCurrency.CASHBACK.value:
+        if reward_currency == CURRENCY_CASHBACK:
             return 1.0
         if 'aeroplan' in program_lower:
             return 1.8
@@ -201,17 +325,27 @@ class CreditCardScraper:
             return 0.7
         if 'aventura' in program_lower:
             return 1.0
-        if reward_currency == RewardCurrency.AIRLINE_MILES.value:
+        if reward_currency == CURRENCY_AIRLINE_MILES:
             return 1.5
-        if reward_currency == RewardCurrency.HOTEL_POINTS.value:
+        if reward_currency == CURRENCY_HOTEL_POINTS:
             return 0.7
         return 1.0
 
 
+    def _fetch_page(self, url: str) -> bytes:
+        """Fetch a page with the shared session and return its raw content."""
+        # dict.setdefault is atomic, so every thread gets the same lock for a host
+        with self._host_locks.setdefault(urlparse(url).hostname, threading.Semaphore(1)):
+            response = self.session.get(url)
+            time.sleep(self.delay)
+        response.raise_for_status()
+        return response.content
+
     def scrape_ratehub(self) -> list[CreditCard]:
         """Scrape credit card data from Ratehub.ca (Canadian comparison site)."""
         print("Scraping Ratehub.ca for Canadian credit cards...")
         cards = []
+        seen_keys: set[str] = set()
         
         # Ratehub categories to scrape
         categories = [
@@ -221,32 +355,36 @@ class CreditCardScraper:
             ('no-fee', 'No Fee'),
         ]
         
-        for category_slug, category_name in categories:
-            url = f"https://www.ratehub.ca/credit-cards/{category_slug}"
-            print(f"  Fetching {category_name} cards from {url}")
+        # Pages are fetched from a worker pool but _fetch_page keeps Ratehub to one request
+        # per self.delay; parsing of finished pages overlaps with the remaining fetches
+        with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+            fetches = []
+            for category_slug, category_name in categories:
+                url = f"https://www.ratehub.ca/credit-cards/{category_slug}"
+                print(f"  Fetching {category_name} cards from {url}")
+                fetches.append((category_name, url, executor.submit(self._fetch_page, url)))
             
-            try:
-                response = self.session.get(url, timeout=15)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'lxml')
-                
-                # Find card listings (structure may vary)
-                card_elements = soup.find_all('div', class_=re.compile(r'card-listing|product-card'))
-                
-                for card_el in card_elements:
-                    try:
-                        card = self._parse_ratehub_card(card_el, category_name)
-                        if card and card.card_key not in [c.card_key for c in cards]:
-                            cards.append(card)
-                    except Exception as e:
-                        print(f"    Error parsing card: {e}")
-                        continue
-                
-                time.sleep(self.delay)
-                
-            except Exception as e:
-                print(f"  Error fetching {url}: {e}")
-                continue
+            # Parse in category order so deduplication stays deterministic
+            for category_name, url, future in fetches:
+                try:
+                    soup = BeautifulSoup(future.result(), 'lxml')
+                    
+                    # Find card listings (structure may vary)
+                    card_elements = soup.select(RATEHUB_CARD_SELECTOR)
+                    
+                    for card_el in card_elements:
+                        try:
+                            card = self._parse_ratehub_card(card_el, category_name)
+                            if card and card.card_key not in seen_keys:
+                                seen_keys.add(card.card_key)
+                                cards.append(card)
+                        except Exception as e:
+                            print(f"    Error parsing card: {e}")
+                            continue
+                    
+                except Exception as e:
+                    print(f"  Error fetching {url}: {e}")
+                    continue
         
         print(f"Found {len(cards)} cards from Ratehub")
         return cards
@@ -254,9 +392,9 @@ class CreditCardScraper:
     def _parse_ratehub_card(self, card_el, category: str) -> Optional[CreditCard]:
         """Parse a single card element from Ratehub."""
         # Try to find card name
-        name_el = card_el.find(['h2', 'h3', 'h4'], class_=re.compile(r'card-name|title'))
+        name_el = card_el.select_one(RATEHUB_HEADING_SELECTOR)
         if not name_el:
-            name_el = card_el.find('a', class_=re.compile(r'card-name|title'))
+            name_el = card_el.select_one(RATEHUB_LINK_SELECTOR)
         if not name_el:
             return None
         
@@ -268,7 +406,7 @@ class CreditCardScraper:
         issuer = self._extract_issuer(name)
         
         # Try to find annual fee
-        fee_el = card_el.find(string=re.compile(r'annual fee|yearly fee', re.I))
+        fee_el = card_el.find(string=FEE_LABEL_RE)
         annual_fee = 0.0
         if fee_el:
             fee_text = fee_el.find_parent().get_text() if fee_el.find_parent() else str(fee_el)
@@ -295,64 +433,25 @@ class CreditCardScraper:
         )
 
 
-    def _extract_issuer(self, card_name: str) -> str:
+    # Many listings repeat the same card names across pages, so these are memoized
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _extract_issuer(card_name: str) -> str:
         """Extract issuer from card name."""
-        issuers = {
-            'TD': ['td ', 'td-'],
-            'RBC': ['rbc ', 'royal bank'],
-            'BMO': ['bmo '],
-            'CIBC': ['cibc '],
-            'Scotiabank': ['scotiabank', 'scotia '],
-            'American Express': ['amex', 'american express'],
-            'MBNA': ['mbna '],
-            'Capital One': ['capital one'],
-            'Tangerine': ['tangerine'],
-            'Simplii': ['simplii'],
-            'PC Financial': ['pc ', 'president'],
-            'HSBC': ['hsbc'],
-            'National Bank': ['national bank'],
-            'Desjardins': ['desjardins'],
-        }
-        
-        name_lower = card_name.lower()
-        for issuer, patterns in issuers.items():
-            for pattern in patterns:
-                if pattern in name_lower:
-                    return issuer
-        return "Unknown"
+        return ISSUER_MATCHER.match(card_name.lower(), "Unknown")
 
-    def _extract_reward_program(self, card_name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _extract_reward_program(card_name: str) -> str:
         """Extract reward program from card name."""
-        programs = {
-            'Aeroplan': ['aeroplan'],
-            'Scene+': ['scene'],
-            'Air Miles': ['air miles'],
-            'Avion': ['avion'],
-            'TD Rewards': ['td rewards', 'td first class'],
-            'BMO Rewards': ['bmo rewards'],
-            'Aventura': ['aventura'],
-            'Membership Rewards': ['membership rewards', 'amex', 'cobalt', 'gold rewards', 'platinum'],
-            'Cashback': ['cash back', 'cashback', 'cash-back'],
-            'PC Optimum': ['pc optimum', 'pc financial'],
-            'Triangle Rewards': ['triangle'],
-            'Marriott Bonvoy': ['marriott', 'bonvoy'],
-            'Hilton Honors': ['hilton'],
-            'WestJet Rewards': ['westjet'],
-        }
-        
-        name_lower = card_name.lower()
-        for program, patterns in programs.items():
-            for pattern in patterns:
-                if pattern in name_lower:
-                    return program
-        return "Points"
+        return REWARD_PROGRAM_MATCHER.match(card_name.lower(), "Points")
 
     def load_from_json(self, filepath: str) -> list[CreditCard]:
         """Load card data from a JSON file (e.g., existing cards.json)."""
         print(f"Loading cards from {filepath}...")
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filepath, 'rb') as f:
+            data = orjson.loads(f.read())
         
         cards = []
         for card_data in data.get('cards', []):
@@ -401,35 +500,15 @@ class CreditCardScraper:
         data = {
             'scraped_at': datetime.now().isoformat(),
             'count': len(self.cards),
-            'cards': [self._card_to_dict(card) for card in self.cards]
+            # orjson serializes the card dataclasses (and nested rewards/bonus) natively
+            'cards': self.cards,
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
         
         print(f"Saved {len(self.cards)} cards to {filepath}")
 
-    def _card_to_dict(self, card: CreditCard) -> dict:
-        """Convert CreditCard to dictionary for JSON serialization."""
-        result = {
-            'card_key': card.card_key,
-            'name': card.name,
-            'name_fr': card.name_fr,
-            'issuer': card.issuer,
-            'reward_program': card.reward_program,
-            'reward_currency': card.reward_currency,
-            'point_valuation': card.point_valuation,
-            'annual_fee': card.annual_fee,
-            'base_reward_rate': card.base_reward_rate,
-            'base_reward_unit': card.base_reward_unit,
-            'image_url': card.image_url,
-            'apply_url': card.apply_url,
-            'category_rewards': [asdict(cr) for cr in card.category_rewards],
-        }
-        if card.signup_bonus:
-            result['signup_bonus'] = asdict(card.signup_bonus)
-        return result
-
     def upload_to_supabase(self):
         """Upload all scraped cards to Supabase."""
         from credit_card_uploader import CreditCardUploader
@@ -471,6 +550,7 @@ def main():
             existing_keys = {c.card_key for c in scraper.cards}
             for card in web_cards:
                 if card.card_key not in existing_keys:
+                    existing_keys.add(card.card_key)
                     scraper.cards.append(card)
         except Exception as e:
             print(f"Error scraping web: {e}")
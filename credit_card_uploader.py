@@ -4,27 +4,116 @@ Handles the cards, category_rewards, and signup_bonuses tables.
 """
 
 import os
+import hashlib
+import random
+import time
+import httpx
+import orjson
 from supabase import create_client, Client
 from dotenv import load_dotenv
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 
 load_dotenv()
 
+# Rows per insert/upsert request; PostgREST throughput levels off past ~1000 rows
+UPSERT_BATCH_SIZE = 1000
+# Ids per in.(...) filter, kept small enough to stay under URL length limits
+FILTER_BATCH_SIZE = 200
+# Small bounded pool (3 kept alive, 2 overflow) recycled every 30 minutes
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=5, max_keepalive_connections=3, keepalive_expiry=1800)
+# Uploads larger than this use COPY instead of PostgREST when SUPABASE_DB_URL is set
+COPY_THRESHOLD = 1000
+# Concurrent upload requests, matched to the pool cap above
+UPLOAD_WORKERS = 5
+# Throttled/unavailable responses mean PostgREST did not process the request, so even inserts can be resent
+RETRY_STATUSES = frozenset({429, 503})
+# Attempts per request, waiting RETRY_BACKOFF * 2^attempt seconds (with jitter) between them
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+
+
+def _content_hash(row: dict, card) -> str:
+    """Hash everything uploaded for a card (row, category rewards, signup bonus) to detect changes."""
+    payload = orjson.dumps([row, card.category_rewards, card.signup_bonus])
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class OrjsonClient(httpx.Client):
+    """
+    httpx client that encodes JSON request bodies with orjson instead of the stdlib json module,
+    and resends requests the server turned away as throttled or unavailable.
+    """
+
+    def build_request(self, method, url, *, json=None, content=None, headers=None, **kwargs):
+        if json is not None:
+            content = orjson.dumps(json)
+            headers = httpx.Headers(headers)
+            headers.setdefault('Content-Type', 'application/json')
+        return super().build_request(method, url, content=content, headers=headers, **kwargs)
+
+    def send(self, request, **kwargs):
+        for attempt in range(RETRY_ATTEMPTS):
+            response = super().send(request, **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt == RETRY_ATTEMPTS - 1:
+                return response
+            response.close()
+            # Jitter spreads concurrent upload workers out so they don't retry in lockstep
+            time.sleep(RETRY_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+def use_http2_session(client: Client) -> Client:
+    """
+    Swap the client's PostgREST session for an HTTP/2 one with long-lived keep-alive.
+    
+    Bulk uploads make many requests to the same host; multiplexing them over one
+    persistent connection pays the TCP + TLS handshake once instead of per request.
+    
+    The old session's timeout, redirect and TLS verification settings carry over.
+    The pool is capped so concurrent bulk work can't exhaust the Supabase pooler's
+    client connections, idle connections are recycled after 30 minutes, and a
+    connection that fails to open is retried once. Upsert bodies are serialized
+    with orjson, and throttled requests are retried with backoff (see OrjsonClient).
+    """
+    session = client.postgrest.session
+    # The old transport's SSL context carries its verify setting (CA bundle, or verification off)
+    ssl_context = getattr(getattr(session._transport, '_pool', None), '_ssl_context', True)
+    client.postgrest.session = OrjsonClient(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=session.timeout,
+        follow_redirects=session.follow_redirects,
+        transport=httpx.HTTPTransport(
+            verify=ssl_context, http2=True, limits=HTTP_POOL_LIMITS, retries=1
+        ),
+    )
+    session.close()
+    return client
+
+
+def _chunks(items: list, size: int):
+    """Yield successive slices of at most `size` items."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
 
 class CreditCardUploader:
     """Handles uploading credit card data to Supabase."""
 
-    def __init__(self, url: Optional[str] = None, key: Optional[str] = None):
+    def __init__(self, url: Optional[str] = None, key: Optional[str] = None, db_url: Optional[str] = None):
         """
         Initialize Supabase client.
         
         Args:
             url: Supabase project URL (or set SUPABASE_URL env var)
             key: Supabase service role key (or set SUPABASE_KEY env var)
+            db_url: Postgres connection string for COPY loads (or set SUPABASE_DB_URL env var)
         """
         self.url = url or os.getenv('SUPABASE_URL')
         self.key = key or os.getenv('SUPABASE_KEY')
+        # Optional direct Postgres connection string, used for COPY on very large uploads
+        self.db_url = db_url or os.getenv('SUPABASE_DB_URL')
         
         if not self.url or not self.key:
             raise ValueError(
@@ -33,11 +122,13 @@ class CreditCardUploader:
             )
         
         self.client: Client = create_client(self.url, self.key)
+        use_http2_session(self.client)
 
     def upload_cards(self, cards: list) -> dict:
         """
         Upload credit cards to Supabase.
-        Handles cards, category_rewards, and signup_bonuses tables.
+        Handles cards, category_rewards, and signup_bonuses tables with one bulk
+        request per table instead of several round-trips per card.
         
         Args:
             cards: List of CreditCard objects from the scraper
@@ -48,43 +139,90 @@ class CreditCardUploader:
         results = {
             'cards_inserted': 0,
             'cards_updated': 0,
+            'cards_unchanged': 0,
             'category_rewards_inserted': 0,
             'signup_bonuses_inserted': 0,
             'errors': []
         }
         
-        for card in cards:
+        # One row per card_key (last one wins); Postgres rejects an upsert that touches a row twice
+        cards_by_key = {card.card_key: card for card in cards}
+        if not cards_by_key:
+            return results
+        card_keys = list(cards_by_key)
+        
+        try:
+            # Stored hashes tell unchanged cards apart and existing keys give inserted vs updated counts;
+            # one in.(...) lookup per batch of keys rather than a select per card
+            existing_hashes = {}
+            for batch in _chunks(card_keys, FILTER_BATCH_SIZE):
+                existing = self.client.table('cards').select('card_key, content_hash').in_('card_key', batch).execute()
+                existing_hashes.update((row['card_key'], row['content_hash']) for row in existing.data)
+        except Exception as e:
+            results['errors'].extend({'card': key, 'error': str(e)} for key in card_keys)
+            return results
+        
+        # One timestamp for the whole upload, in UTC
+        now_iso = datetime.now(timezone.utc).isoformat()
+        rows = [self._build_card_row(card, now_iso) for card in cards_by_key.values()]
+        
+        # Only write cards whose content changed since the last upload
+        rows = [row for row in rows if existing_hashes.get(row['card_key']) != row['content_hash']]
+        results['cards_unchanged'] = len(cards_by_key) - len(rows)
+        if not rows:
+            return results
+        
+        # Cards are written without a hash; it is stored only once their rewards and bonuses have
+        # been replaced, so a failed child write leaves the card changed and it is retried next run
+        hashes = {}
+        for row in rows:
+            hashes[row['card_key']] = row['content_hash']
+            row['content_hash'] = None
+        
+        # Very large uploads go straight to Postgres with COPY when a database URL is set
+        if self.db_url and len(rows) > COPY_THRESHOLD:
             try:
-                card_result = self._upsert_card(card)
-                if card_result.get('inserted'):
-                    results['cards_inserted'] += 1
-                else:
-                    results['cards_updated'] += 1
-                
-                card_id = card_result.get('id')
-                if card_id:
-                    # Upload category rewards
-                    cr_count = self._upsert_category_rewards(card_id, card.category_rewards)
-                    results['category_rewards_inserted'] += cr_count
-                    
-                    # Upload signup bonus
-                    if card.signup_bonus:
-                        sb_result = self._upsert_signup_bonus(card_id, card.signup_bonus)
-                        if sb_result:
-                            results['signup_bonuses_inserted'] += 1
-                            
+                card_ids = self._copy_card_rows(rows)
             except Exception as e:
-                results['errors'].append({
-                    'card': card.card_key,
-                    'error': str(e)
-                })
+                results['errors'].extend({'card': key, 'error': str(e)} for key in card_keys)
+                return results
+        else:
+            card_ids = self._upsert_card_rows(rows, results['errors'])
         
-        return results
+        results['cards_inserted'] = sum(1 for key in card_ids if key not in existing_hashes)
+        results['cards_updated'] = len(card_ids) - results['cards_inserted']
+        
+        # Rewards and bonuses live in separate tables, so both can be replaced at once;
+        # unchanged cards have no id in card_ids and keep what they have
+        children_written = True
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            rewards = executor.submit(self._replace_category_rewards, cards_by_key, card_ids)
+            bonuses = executor.submit(self._replace_signup_bonuses, cards_by_key, card_ids)
+            
+            try:
+                results['category_rewards_inserted'] = rewards.result()
+            except Exception as e:
+                children_written = False
+                results['errors'].append({'card': 'category_rewards', 'error': str(e)})
+            
+            try:
+                results['signup_bonuses_inserted'] = bonuses.result()
+            except Exception as e:
+                children_written = False
+                results['errors'].append({'card': 'signup_bonuses', 'error': str(e)})
+        
+        if card_ids and children_written:
+            try:
+                # One UPDATE for all written cards (set_card_hashes() in schema.sql)
+                self.client.rpc('set_card_hashes', {'hashes': {key: hashes[key] for key in card_ids}}).execute()
+            except Exception as e:
+                results['errors'].append({'card': 'content_hash', 'error': str(e)})
 
+        return results
 
-    def _upsert_card(self, card) -> dict:
-        """Insert or update a single card."""
-        card_data = {
+    def _build_card_row(self, card, now_iso: str) -> dict:
+        """Build the cards table row for a single card, including its content hash."""
+        row = {
             'card_key': card.card_key,
             'name': card.name,
             'name_fr': card.name_fr,
@@ -98,101 +236,150 @@ class CreditCardUploader:
             'image_url': card.image_url,
             'apply_url': card.apply_url,
             'is_active': True,
-            'updated_at': datetime.now().isoformat(),
         }
+        row['content_hash'] = _content_hash(row, card)
+        row['updated_at'] = now_iso
+        return row
+
+    def _upsert_card_rows(self, rows: list, errors: list) -> dict:
+        """
+        Upsert card rows through PostgREST and return their ids keyed by card_key.
         
-        # Check if card exists
-        existing = self.client.table('cards').select('id').eq('card_key', card.card_key).execute()
+        Rows go in batches to stay under PostgREST payload limits; batches are
+        independent, so they run concurrently and a failed batch doesn't sink the rest.
+        """
+        card_ids = {}
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+            upserts = [
+                (batch, executor.submit(self._upsert_card_batch, batch))
+                for batch in _chunks(rows, UPSERT_BATCH_SIZE)
+            ]
+            for batch, future in upserts:
+                try:
+                    card_ids.update(future.result())
+                except Exception as e:
+                    errors.extend({'card': row['card_key'], 'error': str(e)} for row in batch)
+        return card_ids
+
+    def _upsert_card_batch(self, rows: list) -> dict:
+        """Upsert a batch of card rows and return their ids keyed by card_key."""
+        upserted = self.client.table('cards').upsert(rows, on_conflict='card_key').execute()
+        return {row['card_key']: row['id'] for row in upserted.data}
+
+    def _copy_card_rows(self, rows: list) -> dict:
+        """
+        Load card rows straight into Postgres with COPY, bypassing PostgREST.
         
-        if existing.data:
-            # Update existing card
-            card_id = existing.data[0]['id']
-            self.client.table('cards').update(card_data).eq('id', card_id).execute()
-            return {'id': card_id, 'inserted': False}
-        else:
-            # Insert new card
-            result = self.client.table('cards').insert(card_data).execute()
-            card_id = result.data[0]['id'] if result.data else None
-            return {'id': card_id, 'inserted': True}
-
-    def _upsert_category_rewards(self, card_id: str, category_rewards: list) -> int:
-        """Insert or update category rewards for a card."""
-        if not category_rewards:
-            return 0
+        COPY can't upsert, so rows are copied into a temp table and merged into
+        cards with a single INSERT ... ON CONFLICT. Returns ids keyed by card_key.
+        """
+        import psycopg
         
-        # Delete existing category rewards for this card
-        self.client.table('category_rewards').delete().eq('card_id', card_id).execute()
+        columns = list(rows[0])
+        column_list = ', '.join(columns)
+        updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in columns if column != 'card_key')
         
-        # Insert new category rewards
+        with psycopg.connect(self.db_url) as conn, conn.cursor() as cur:
+            cur.execute("CREATE TEMP TABLE cards_load (LIKE cards INCLUDING DEFAULTS) ON COMMIT DROP")
+            with cur.copy(f"COPY cards_load ({column_list}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row([row[column] for column in columns])
+            cur.execute(
+                f"INSERT INTO cards ({column_list}) SELECT {column_list} FROM cards_load "
+                f"ON CONFLICT (card_key) DO UPDATE SET {updates} "
+                f"RETURNING card_key, id"
+            )
+            return {card_key: str(card_id) for card_key, card_id in cur.fetchall()}
+
+    def _replace_category_rewards(self, cards_by_key: dict, card_ids: dict) -> int:
+        """Replace category rewards for all cards that have them in one delete and one insert."""
         rewards_data = []
-        for cr in category_rewards:
-            rewards_data.append({
-                'card_id': card_id,
-                'category': cr.category,
-                'multiplier': cr.multiplier,
-                'reward_unit': cr.reward_unit,
-                'description': cr.description,
-                'description_fr': cr.description_fr,
-                'has_spend_limit': cr.has_spend_limit,
-                'spend_limit': cr.spend_limit,
-                'spend_limit_period': cr.spend_limit_period,
-            })
+        for card_key, card in cards_by_key.items():
+            card_id = card_ids.get(card_key)
+            if not card_id:
+                continue
+            for cr in card.category_rewards:
+                rewards_data.append({
+                    'card_id': card_id,
+                    'category': cr.category,
+                    'multiplier': cr.multiplier,
+                    'reward_unit': cr.reward_unit,
+                    'description': cr.description,
+                    'description_fr': cr.description_fr,
+                    'has_spend_limit': cr.has_spend_limit,
+                    'spend_limit': cr.spend_limit,
+                    'spend_limit_period': getattr(cr, 'spend_limit_period', None),
+                })
         
-        if rewards_data:
-            self.client.table('category_rewards').insert(rewards_data).execute()
+        if not rewards_data:
+            return 0
         
+        # Only cards that brought new rewards have their existing ones cleared
+        reward_card_ids = list({row['card_id'] for row in rewards_data})
+        for batch in _chunks(reward_card_ids, FILTER_BATCH_SIZE):
+            self.client.table('category_rewards').delete(returning='minimal').in_('card_id', batch).execute()
+        for batch in _chunks(rewards_data, UPSERT_BATCH_SIZE):
+            self.client.table('category_rewards').insert(batch, returning='minimal').execute()
         return len(rewards_data)
 
-    def _upsert_signup_bonus(self, card_id: str, signup_bonus) -> bool:
-        """Insert or update signup bonus for a card."""
-        if not signup_bonus:
-            return False
-        
-        # Delete existing signup bonus for this card
-        self.client.table('signup_bonuses').delete().eq('card_id', card_id).execute()
-        
-        # Insert new signup bonus
-        bonus_data = {
-            'card_id': card_id,
-            'bonus_amount': signup_bonus.bonus_amount,
-            'bonus_currency': signup_bonus.bonus_currency,
-            'spend_requirement': signup_bonus.spend_requirement,
-            'timeframe_days': signup_bonus.timeframe_days,
-            'valid_until': signup_bonus.valid_until,
-            'is_active': True,
-        }
+    def _replace_signup_bonuses(self, cards_by_key: dict, card_ids: dict) -> int:
+        """Replace signup bonuses for all cards that have one in one delete and one insert."""
+        bonus_data = []
+        for card_key, card in cards_by_key.items():
+            card_id = card_ids.get(card_key)
+            signup_bonus = card.signup_bonus
+            if not card_id or not signup_bonus:
+                continue
+            bonus_data.append({
+                'card_id': card_id,
+                'bonus_amount': signup_bonus.bonus_amount,
+                'bonus_currency': signup_bonus.bonus_currency,
+                'spend_requirement': signup_bonus.spend_requirement,
+                'timeframe_days': signup_bonus.timeframe_days,
+                'valid_until': getattr(signup_bonus, 'valid_until', None),
+                'is_active': True,
+            })
         
-        self.client.table('signup_bonuses').insert(bonus_data).execute()
-        return True
+        if not bonus_data:
+            return 0
+        
+        bonus_card_ids = [row['card_id'] for row in bonus_data]
+        for batch in _chunks(bonus_card_ids, FILTER_BATCH_SIZE):
+            self.client.table('signup_bonuses').delete(returning='minimal').in_('card_id', batch).execute()
+        for batch in _chunks(bonus_data, UPSERT_BATCH_SIZE):
+            self.client.table('signup_bonuses').insert(batch, returning='minimal').execute()
+        return len(bonus_data)
 
-    def get_all_cards(self) -> list:
-        """Fetch all cards from Supabase."""
-        result = self.client.table('cards').select('*').eq('is_active', True).execute()
+    def get_all_cards(self, columns: Optional[list] = None) -> list:
+        """Fetch all cards from Supabase, optionally only the given columns."""
+        select = ', '.join(columns) if columns else '*'
+        result = self.client.table('cards').select(select).eq('is_active', True).execute()
         return result.data
 
     def get_card_with_rewards(self, card_key: str) -> dict:
         """Fetch a card with its category rewards and signup bonus."""
-        # Get card
-        card_result = self.client.table('cards').select('*').eq('card_key', card_key).execute()
+        # Embed rewards and active bonuses so everything comes back in one request
+        card_result = (
+            self.client.table('cards')
+            .select('*, category_rewards(*), signup_bonuses(*)')
+            .eq('card_key', card_key)
+            .eq('signup_bonuses.is_active', True)
+            .limit(1)
+            .execute()
+        )
         if not card_result.data:
             return None
         
         card = card_result.data[0]
-        card_id = card['id']
-        
-        # Get category rewards
-        cr_result = self.client.table('category_rewards').select('*').eq('card_id', card_id).execute()
-        card['category_rewards'] = cr_result.data
-        
-        # Get signup bonus
-        sb_result = self.client.table('signup_bonuses').select('*').eq('card_id', card_id).eq('is_active', True).execute()
-        card['signup_bonus'] = sb_result.data[0] if sb_result.data else None
+        signup_bonuses = card.pop('signup_bonuses', None)
+        card['signup_bonus'] = signup_bonuses[0] if signup_bonuses else None
         
         return card
 
     def delete_card(self, card_key: str) -> bool:
         """Soft delete a card by setting is_active to False."""
-        result = self.client.table('cards').update({'is_active': False}).eq('card_key', card_key).execute()
+        # Clearing the hash makes the next upload of this card rewrite it, reactivating it
+        result = self.client.table('cards').update({'is_active': False, 'content_hash': None}).eq('card_key', card_key).execute()
         return len(result.data) > 0
 
     def get_cards_by_issuer(self, issuer: str) -> list:
@@ -202,13 +389,14 @@ class CreditCardUploader:
 
     def get_cards_by_category(self, category: str) -> list:
         """Fetch all cards that have bonus rewards for a category."""
-        # Get card IDs with this category
-        cr_result = self.client.table('category_rewards').select('card_id').eq('category', category).execute()
-        card_ids = [cr['card_id'] for cr in cr_result.data]
-        
-        if not card_ids:
-            return []
-        
-        # Get cards
-        result = self.client.table('cards').select('*').in_('id', card_ids).eq('is_active', True).execute()
+        # Inner-join embed filters cards by their rewards in a single request
+        result = (
+            self.client.table('cards')
+            .select('*, category_rewards!inner(category)')
+            .eq('category_rewards.category', category)
+            .eq('is_active', True)
+            .execute()
+        )
+        for card in result.data:
+            card.pop('category_rewards', None)
         return result.data
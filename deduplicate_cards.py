@@ -5,78 +5,106 @@ Prioritizes cards with category rewards and more complete data.
 from supabase import create_client
 import os
 from dotenv import load_dotenv
-from collections import defaultdict
+from itertools import groupby
+from operator import attrgetter
+from dataclasses import dataclass
+from typing import Optional
+import re
 
 load_dotenv(override=True)
 
+# Rows per page when reading category_rewards
+PAGE_SIZE = 1000
+
+# Columns loaded into CardRow
+CARD_ROW_FIELDS = ('id', 'card_key', 'name', 'issuer', 'annual_fee', 'base_reward_rate')
+
 client = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
 
 print("=" * 60)
 print("DEDUPLICATING CARDS")
 print("=" * 60)
 
-# Get all cards
-all_cards = client.table('cards').select('*').execute()
+# Get all cards, only the columns CardRow needs
+all_cards = client.table('cards').select(', '.join(CARD_ROW_FIELDS)).execute()
 print(f"\nTotal cards: {len(all_cards.data)}")
 
-# Get category rewards for each card
-category_rewards = client.table('category_rewards').select('card_id').execute()
-cards_with_rewards = set(r['card_id'] for r in category_rewards.data)
+# Get the ids of cards with category rewards, one page at a time so memory stays bounded
+cards_with_rewards = set()
+offset = 0
+while True:
+    page = (
+        client.table('category_rewards').select('card_id')
+        .order('id').range(offset, offset + PAGE_SIZE - 1).execute()
+    )
+    cards_with_rewards.update(r['card_id'] for r in page.data)
+    if len(page.data) < PAGE_SIZE:
+        break
+    offset += PAGE_SIZE
+
+# Common prefixes/suffixes stripped from card names, longest alternative first
+NORMALIZE_RE = re.compile(r'®|™|\*|mastercard|card|visa|best |perks of the ')
 
-# Group cards by normalized name
 def normalize_name(name):
     """Normalize card name for comparison"""
-    name = name.lower()
-    # Remove common prefixes/suffixes
-    name = name.replace('®', '').replace('™', '').replace('*', '')
-    name = name.replace('card', '').replace('mastercard', '').replace('visa', '')
-    name = name.replace('best ', '').replace('perks of the ', '')
-    name = name.replace('  ', ' ').strip()
-    return name
-
-# Group cards by issuer and normalized name
-card_groups = defaultdict(list)
-for card in all_cards.data:
-    key = (card['issuer'].lower(), normalize_name(card['name']))
-    card_groups[key].append(card)
+    return ' '.join(NORMALIZE_RE.sub('', name.lower()).split())
+
+@dataclass(slots=True)
+class CardRow:
+    """A card row with the normalized key and score computed once when it's loaded."""
+    id: str
+    card_key: str
+    name: str
+    issuer: str
+    annual_fee: Optional[float]
+    base_reward_rate: Optional[float]
+    issuer_lc: str = ''
+    norm: str = ''
+    score: int = 0
+
+    def __post_init__(self):
+        self.issuer_lc = self.issuer.lower()
+        self.norm = normalize_name(self.name)
+        self.score = score_card(self)
+
+def score_card(card):
+    """Score a card by data completeness (higher is better); mirrors dedupe_cards() in schema.sql"""
+    score = 0
+    # Has category rewards? +100
+    if card.id in cards_with_rewards:
+        score += 100
+    # Shorter card_key (usually cleaner) +10
+    if len(card.card_key) < 50:
+        score += 10
+    # Has annual fee data +5
+    if card.annual_fee is not None:
+        score += 5
+    # Base reward rate > 0 +5
+    if (card.base_reward_rate or 0) > 0:
+        score += 5
+    return score
+
+# Normalize and score each card once, keeping the results on a slotted row
+card_rows = [CardRow(**row) for row in all_cards.data]
+
+# Sort so each group is contiguous and already ordered by score (highest first),
+# ties broken by id to match dedupe_cards()
+group_key = attrgetter('issuer_lc', 'norm')
+sorted_cards = sorted(card_rows, key=lambda c: (group_key(c), -c.score, c.id))
 
 # Find duplicates
 duplicates_found = 0
 cards_to_delete = []
 
-for (issuer, norm_name), cards in card_groups.items():
-    if len(cards) > 1:
-        duplicates_found += len(cards) - 1
-        
-        # Score each card (higher is better)
-        scored_cards = []
-        for card in cards:
-            score = 0
-            # Has category rewards? +100
-            if card['id'] in cards_with_rewards:
-                score += 100
-            # Shorter card_key (usually cleaner) +10
-            if len(card['card_key']) < 50:
-                score += 10
-            # Has annual fee data +5
-            if card['annual_fee'] is not None:
-                score += 5
-            # Base reward rate > 0 +5
-            if card['base_reward_rate'] > 0:
-                score += 5
-            
-            scored_cards.append((score, card))
-        
-        # Sort by score (highest first)
-        scored_cards.sort(reverse=True, key=lambda x: x[0])
-        
-        # Keep the best one, delete the rest
-        best_card = scored_cards[0][1]
-        for score, card in scored_cards[1:]:
-            cards_to_delete.append(card)
-            print(f"\n  Duplicate: {card['name'][:60]}")
-            print(f"    Keeping: {best_card['card_key']} (score: {scored_cards[0][0]})")
-            print(f"    Deleting: {card['card_key']} (score: {score})")
+for (issuer, norm_name), group in groupby(sorted_cards, key=group_key):
+    # Keep the best one, delete the rest
+    best_card, *duplicates = group
+    duplicates_found += len(duplicates)
+    for card in duplicates:
+        cards_to_delete.append(card)
+        print(f"\n  Duplicate: {card.name[:60]}")
+        print(f"    Keeping: {best_card.card_key} (score: {best_card.score})")
+        print(f"    Deleting: {card.card_key} (score: {card.score})")
 
 print(f"\n" + "=" * 60)
 print(f"Found {duplicates_found} duplicate cards")
@@ -87,15 +115,14 @@ if cards_to_delete:
     confirm = input("\nProceed with deletion? (yes/no): ")
     if confirm.lower() == 'yes':
         print("\nDeleting duplicates...")
-        for card in cards_to_delete:
-            # Delete category rewards first
-            client.table('category_rewards').delete().eq('card_id', card['id']).execute()
-            # Delete signup bonuses
-            client.table('signup_bonuses').delete().eq('card_id', card['id']).execute()
-            # Delete card
-            client.table('cards').delete().eq('id', card['id']).execute()
+        # dedupe_cards() (see schema.sql) deletes exactly the cards listed above in one statement,
+        # skipping any the database no longer scores as a duplicate; rewards/bonuses go with them
+        # via ON DELETE CASCADE
+        deleted = client.rpc('dedupe_cards', {'card_ids': [card.id for card in cards_to_delete]}).execute()
         
-        print(f"✓ Deleted {len(cards_to_delete)} duplicate cards")
+        print(f"✓ Deleted {len(deleted.data)} duplicate cards")
+        if len(deleted.data) < len(cards_to_delete):
+            print(f"  Skipped {len(cards_to_delete) - len(deleted.data)} cards that are no longer duplicates")
         
         # Show final count
         remaining = client.table('cards').select('id', count='exact').execute()
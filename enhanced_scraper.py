@@ -7,15 +7,24 @@ Enhanced Canadian Credit Card Scraper
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.lexbor import LexborHTMLParser
+import orjson
+import numpy as np
 import re
+import threading
+import time
+from urllib.parse import urlparse
 from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import Optional, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import os
 from dotenv import load_dotenv
+from credit_card_scraper import KeywordMatcher
 
 load_dotenv()
 
@@ -24,7 +33,7 @@ load_dotenv()
 # Data Models
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class CategoryReward:
     category: str
     multiplier: float
@@ -35,7 +44,7 @@ class CategoryReward:
     spend_limit: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SignupBonus:
     bonus_amount: int
     bonus_currency: str
@@ -43,7 +52,7 @@ class SignupBonus:
     timeframe_days: int
 
 
-@dataclass 
+@dataclass(slots=True)
 class CreditCard:
     card_key: str
     name: str
@@ -103,6 +112,15 @@ KNOWN_CARDS = {
     "canadian-tire-triangle-mastercard": {"issuer": "Canadian Tire", "program": "Triangle Rewards", "fee_range": (0, 0)},
 }
 
+# Flat per-field views of KNOWN_CARDS, built once so verification reads a single field directly
+KNOWN_KEYS = frozenset(KNOWN_CARDS)
+KNOWN_ISSUER = {key: known["issuer"] for key, known in KNOWN_CARDS.items()}
+KNOWN_FEE_RANGE = {key: known["fee_range"] for key, known in KNOWN_CARDS.items()}
+
+
+# Reward currencies a card may have
+VALID_CURRENCIES = frozenset(("cashback", "points", "airline_miles", "hotel_points"))
+
 
 # Known category reward patterns for popular cards
 KNOWN_CATEGORY_REWARDS = {
@@ -127,6 +145,164 @@ KNOWN_CATEGORY_REWARDS = {
     ],
 }
 
+# KNOWN_CATEGORY_REWARDS as ready-made CategoryReward objects, built once at import
+KNOWN_CATEGORY_REWARDS_BUILT = {
+    key: tuple(
+        CategoryReward(
+            category=r["category"],
+            multiplier=r["multiplier"],
+            reward_unit=r["unit"],
+            description=f"{r['multiplier']}{'x' if r['unit'] == 'multiplier' else '%'} on {r['category']}"
+        )
+        for r in rewards
+    )
+    for key, rewards in KNOWN_CATEGORY_REWARDS.items()
+}
+
+
+# =============================================================================
+# Parsing Patterns
+# =============================================================================
+
+# Compiled once at import instead of on every call
+FEE_AMOUNT_RE = re.compile(r'\$?([\d,]+(?:\.\d{2})?)')
+ANNUAL_FEE_RE = re.compile(r'annual fee[:\s]*\$?([\d,]+)', re.I)
+MULTIPLIER_RATE_RE = re.compile(r'([\d.]+)\s*x')
+PERCENT_RATE_RE = re.compile(r'([\d.]+)\s*%')
+NUMBER_RE = re.compile(r'([\d.]+)')
+
+# Card keys keep only [a-z0-9], whitespace and dashes; ASCII input is filtered with
+# str.translate and the regex is only needed for the rare non-ASCII name
+KEY_INVALID_RE = re.compile(r'[^a-z0-9\s-]')
+KEY_ASCII_TABLE = str.maketrans({chr(c): None for c in range(128) if KEY_INVALID_RE.match(chr(c))})
+KEY_SEPARATOR_RE = re.compile(r'[\s-]+')
+
+# Page structure: card containers, card titles and card-name headings
+CARD_CLASS_RE = re.compile(r'card|product', re.I)
+LISTING_CLASS_RE = re.compile(r'card|product|listing', re.I)
+TITLE_CLASS_RE = re.compile(r'title|name|heading', re.I)
+CARD_HEADING_RE = re.compile(r'(Visa|Mastercard|Card|Amex)', re.I)
+NETWORK_HEADING_RE = re.compile(r'(Visa|Mastercard|Card)', re.I)
+LEADING_NUMBER_RE = re.compile(r'^\d+\.\s*')
+TRAILING_DASH_RE = re.compile(r'\s*[-–].*$')
+# GreedyRates headings that name one of these issuers as a whole word
+GREEDYRATES_ISSUER_RE = re.compile(r'\b(TD|RBC|BMO|CIBC|Scotiabank|Amex|Tangerine)\b')
+
+# "<rate>x/% on <category>" phrases for every category in one pattern; the word maps to its category
+CATEGORY_WORDS = {
+    'groceries': 'groceries', 'grocery': 'groceries',
+    'dining': 'dining', 'restaurant': 'dining',
+    'gas': 'gas', 'fuel': 'gas',
+    'travel': 'travel',
+    'drugstore': 'drugstores', 'pharmacy': 'drugstores',
+    'entertainment': 'entertainment', 'movie': 'entertainment',
+    'online': 'online_shopping', 'amazon': 'online_shopping',
+}
+# Order rewards are listed in
+CATEGORY_ORDER = list(dict.fromkeys(CATEGORY_WORDS.values()))
+CATEGORY_REWARD_RE = re.compile(
+    r'(\d+(?:\.\d+)?)\s*[x%]\s*(?:on\s+)?(?:at\s+)?(' + '|'.join(CATEGORY_WORDS) + ')'
+)
+
+
+# Name classifiers: (keyword, value) in priority order, each resolved in one regex scan
+ISSUER_MATCHER = KeywordMatcher([
+    ('td ', 'TD'), ('rbc ', 'RBC'), ('bmo ', 'BMO'),
+    ('cibc ', 'CIBC'), ('scotiabank', 'Scotiabank'), ('scotia ', 'Scotiabank'),
+    ('amex', 'American Express'), ('american express', 'American Express'),
+    ('mbna', 'MBNA'), ('capital one', 'Capital One'),
+    ('tangerine', 'Tangerine'), ('simplii', 'Simplii'),
+    ('pc financial', 'PC Financial'), ('pc ', 'PC Financial'), ('hsbc', 'HSBC'),
+    ('national bank', 'National Bank'), ('desjardins', 'Desjardins'),
+    ('canadian tire', 'Canadian Tire'), ('triangle', 'Canadian Tire'),
+])
+
+PROGRAM_MATCHER = KeywordMatcher([
+    ('aeroplan', 'Aeroplan'), ('scene', 'Scene+'),
+    ('air miles', 'Air Miles'), ('avion', 'Avion'),
+    ('td rewards', 'TD Rewards'), ('first class', 'TD Rewards'),
+    ('bmo rewards', 'BMO Rewards'), ('eclipse', 'BMO Rewards'),
+    ('aventura', 'Aventura'),
+    ('cobalt', 'Membership Rewards'), ('gold rewards', 'Membership Rewards'),
+    ('platinum', 'Membership Rewards'), ('amex', 'Membership Rewards'),
+    ('cash back', 'Cashback'), ('cashback', 'Cashback'), ('dividend', 'Cashback'), ('simply cash', 'Cashback'),
+    ('pc optimum', 'PC Optimum'), ('pc financial', 'PC Optimum'),
+    ('triangle', 'Triangle Rewards'),
+    ('westjet', 'WestJet Rewards'),
+])
+
+CURRENCY_MATCHER = KeywordMatcher([
+    ('aeroplan', 'airline_miles'), ('air miles', 'airline_miles'), ('avion', 'airline_miles'),
+    ('westjet', 'airline_miles'), ('miles', 'airline_miles'),
+    ('marriott', 'hotel_points'), ('hilton', 'hotel_points'), ('bonvoy', 'hotel_points'), ('hotel', 'hotel_points'),
+    ('cash', 'cashback'), ('cashback', 'cashback'), ('dividend', 'cashback'),
+])
+
+# =============================================================================
+# Sources
+# =============================================================================
+
+# source -> (label, listing pages); each page is parsed by _parse_<source>_page
+SCRAPE_SOURCES = {
+    "creditcardgenius": ("CreditCardGenius.ca", [
+        "https://creditcardgenius.ca/best-credit-cards/cash-back",
+        "https://creditcardgenius.ca/best-credit-cards/travel",
+        "https://creditcardgenius.ca/best-credit-cards/rewards",
+        "https://creditcardgenius.ca/best-credit-cards/no-fee",
+        "https://creditcardgenius.ca/best-credit-cards/groceries",
+    ]),
+    "ratehub": ("Ratehub.ca", [
+        "https://www.ratehub.ca/credit-cards/cash-back",
+        "https://www.ratehub.ca/credit-cards/travel",
+        "https://www.ratehub.ca/credit-cards/rewards",
+        "https://www.ratehub.ca/credit-cards/no-fee",
+    ]),
+    "moneysense": ("MoneySense.ca", [
+        "https://www.moneysense.ca/spend/credit-cards/best-credit-cards-in-canada/",
+        "https://www.moneysense.ca/spend/credit-cards/best-cash-back-credit-cards-in-canada/",
+        "https://www.moneysense.ca/spend/credit-cards/best-travel-credit-cards-in-canada/",
+    ]),
+    "nerdwallet": ("NerdWallet.com/ca", [
+        "https://www.nerdwallet.com/ca/credit-cards/best-cash-back-credit-cards",
+        "https://www.nerdwallet.com/ca/credit-cards/best-travel-credit-cards",
+        "https://www.nerdwallet.com/ca/credit-cards/best-rewards-credit-cards",
+        "https://www.nerdwallet.com/ca/credit-cards/best-no-fee-credit-cards",
+    ]),
+    "greedyrates": ("GreedyRates.ca", [
+        "https://www.greedyrates.ca/blog/best-cash-back-credit-cards-canada/",
+        "https://www.greedyrates.ca/blog/best-travel-credit-cards-canada/",
+        "https://www.greedyrates.ca/blog/best-rewards-credit-cards-canada/",
+        "https://www.greedyrates.ca/blog/best-no-fee-credit-cards-canada/",
+    ]),
+}
+
+# Parts of each source's pages its parser reads; everything else is skipped while parsing
+SOURCE_STRAINERS = {
+    "creditcardgenius": SoupStrainer(['div', 'article'], class_=CARD_CLASS_RE),
+    "ratehub": SoupStrainer(['div', 'article'], class_=LISTING_CLASS_RE),
+}
+
+# Article sources only read heading text, so they're parsed with selectolax and these selectors
+HEADING_SELECTORS = {
+    "moneysense": "h2, h3",
+    "nerdwallet": "h2, h3, h4",
+    "greedyrates": "h2, h3",
+}
+
+# Pages fetched at once across all sources
+SCRAPE_WORKERS = 8
+# Characters of a card element's text searched for its fee and category rewards
+CARD_TEXT_LIMIT = 2000
+# Retry transient failures (rate limits, 5xx) with backoff; only GETs are retried
+FETCH_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=['GET'])
+
+
+# Seconds a cached page stays fresh when SCRAPE_CACHE=1
+SCRAPE_CACHE_TTL = 3600
+
+# Runs with more cards than this are saved as NDJSON instead of one indented document
+NDJSON_THRESHOLD = 1000
+
 
 # =============================================================================
 # Scraper Class
@@ -136,23 +312,49 @@ class EnhancedCreditCardScraper:
     """Enhanced scraper with multiple sources and data verification."""
     
     def __init__(self):
-        self.session = requests.Session()
+        if os.getenv('SCRAPE_CACHE') == '1':
+            # Development runs reuse pages fetched within the last hour from an on-disk cache
+            import requests_cache
+            self.session = requests_cache.CachedSession(
+                'scrape_cache',
+                backend='sqlite',
+                expire_after=SCRAPE_CACHE_TTL,
+                allowable_codes=(200,),
+                allowable_methods=('GET',),
+                stale_if_error=True,
+            )
+        else:
+            self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-CA,en;q=0.9,fr-CA;q=0.8',
         })
+        # Keep connections alive per host, with room for every concurrent fetch
+        adapter = HTTPAdapter(pool_connections=len(SCRAPE_SOURCES), pool_maxsize=SCRAPE_WORKERS, max_retries=FETCH_RETRY)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.cards: Dict[str, CreditCard] = {}  # key -> card
         self.delay = 2.0
+        # One fetch at a time per host, so concurrency spreads across sites instead of hammering one
+        self._host_locks = {
+            urlparse(url).hostname: threading.Semaphore(1)
+            for _, urls in SCRAPE_SOURCES.values() for url in urls
+        }
         self.verification_results = []
-
-    def _generate_key(self, name: str, issuer: str) -> str:
-        combined = f"{issuer}-{name}"
-        key = combined.lower()
-        key = re.sub(r'[^a-z0-9\s-]', '', key)
-        key = re.sub(r'\s+', '-', key)
-        key = re.sub(r'-+', '-', key)
-        return key.strip('-')[:100]
+        # Confidence bumps collected while scraping/enriching, applied by finalize_confidence
+        # (verify_data applies any still pending)
+        self._merge_counts: Dict[str, int] = {}
+        self._enriched_keys = set()
+
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _generate_key(name: str, issuer: str) -> str:
+        key = f"{issuer}-{name}".lower().translate(KEY_ASCII_TABLE)
+        if not key.isascii():
+            key = KEY_INVALID_RE.sub('', key)
+        # Runs of whitespace and dashes collapse to a single dash
+        return KEY_SEPARATOR_RE.sub('-', key).strip('-')[:100]
 
     def _parse_fee(self, text: str) -> float:
         if not text:
@@ -160,7 +362,7 @@ class EnhancedCreditCardScraper:
         text = text.lower().strip()
         if any(x in text for x in ['no annual', 'no fee', '$0', 'free']):
             return 0.0
-        match = re.search(r'\$?([\d,]+(?:\.\d{2})?)', text)
+        match = FEE_AMOUNT_RE.search(text)
         return float(match.group(1).replace(',', '')) if match else 0.0
 
     def _parse_rate(self, text: str) -> tuple:
@@ -168,14 +370,14 @@ class EnhancedCreditCardScraper:
             return (1.0, "percent")
         text = text.lower()
         # Check for multiplier (5x, 5X)
-        match = re.search(r'([\d.]+)\s*x', text)
+        match = MULTIPLIER_RATE_RE.search(text)
         if match:
             return (float(match.group(1)), "multiplier")
         # Check for percentage (5%, 5 percent)
-        match = re.search(r'([\d.]+)\s*%', text)
+        match = PERCENT_RATE_RE.search(text)
         if match:
             return (float(match.group(1)), "percent")
-        match = re.search(r'([\d.]+)', text)
+        match = NUMBER_RE.search(text)
         return (float(match.group(1)), "percent") if match else (1.0, "percent")
 
     def _extract_category_rewards(self, text: str) -> List[CategoryReward]:
@@ -183,18 +385,13 @@ class EnhancedCreditCardScraper:
         rewards = []
         text = text.lower()
         
-        patterns = [
-            (r'(\d+(?:\.\d+)?)\s*[x%]\s*(?:on\s+)?(?:at\s+)?(groceries|grocery)', 'groceries'),
-            (r'(\d+(?:\.\d+)?)\s*[x%]\s*(?:on\s+)?(?:at\s+)?(dining|restaurant)', 'dining'),
-            (r'(\d+(?:\.\d+)?)\s*[x%]\s*(?:on\s+)?(?:at\s+)?(gas|fuel)', 'gas'),
-            (r'(\d+(?:\.\d+)?)\s*[x%]\s*(?:on\s+)?(?:at\s+)?(travel)', 'travel'),
-            (r'(\d+(?:\.\d+)?)\s*[x%]\s*(?:on\s+)?(?:at\s+)?(drugstore|pharmacy)', 'drugstores'),
-            (r'(\d+(?:\.\d+)?)\s*[x%]\s*(?:on\s+)?(?:at\s+)?(entertainment|movie)', 'entertainment'),
-            (r'(\d+(?:\.\d+)?)\s*[x%]\s*(?:on\s+)?(?:at\s+)?(online|amazon)', 'online_shopping'),
-        ]
-        
-        for pattern, category in patterns:
-            match = re.search(pattern, text)
+        # One scan over the text; the first mention of each category wins
+        first_matches = {}
+        for match in CATEGORY_REWARD_RE.finditer(text):
+            first_matches.setdefault(CATEGORY_WORDS[match.group(2)], match)
+        
+        for category in CATEGORY_ORDER:
+            match = first_matches.get(category)
             if match:
                 rate = float(match.group(1))
                 unit = "multiplier" if 'x' in text[match.start():match.end()+2] else "percent"
@@ -207,53 +404,24 @@ class EnhancedCreditCardScraper:
         
         return rewards
 
-    def _get_issuer(self, name: str) -> str:
-        issuers = {
-            'TD': ['td '], 'RBC': ['rbc '], 'BMO': ['bmo '],
-            'CIBC': ['cibc '], 'Scotiabank': ['scotiabank', 'scotia '],
-            'American Express': ['amex', 'american express'],
-            'MBNA': ['mbna'], 'Capital One': ['capital one'],
-            'Tangerine': ['tangerine'], 'Simplii': ['simplii'],
-            'PC Financial': ['pc financial', 'pc '], 'HSBC': ['hsbc'],
-            'National Bank': ['national bank'], 'Desjardins': ['desjardins'],
-            'Canadian Tire': ['canadian tire', 'triangle'],
-        }
-        name_lower = name.lower()
-        for issuer, patterns in issuers.items():
-            if any(p in name_lower for p in patterns):
-                return issuer
-        return "Other"
-
-    def _get_program(self, name: str) -> str:
-        programs = {
-            'Aeroplan': ['aeroplan'], 'Scene+': ['scene'],
-            'Air Miles': ['air miles'], 'Avion': ['avion'],
-            'TD Rewards': ['td rewards', 'first class'],
-            'BMO Rewards': ['bmo rewards', 'eclipse'],
-            'Aventura': ['aventura'],
-            'Membership Rewards': ['cobalt', 'gold rewards', 'platinum', 'amex'],
-            'Cashback': ['cash back', 'cashback', 'dividend', 'simply cash'],
-            'PC Optimum': ['pc optimum', 'pc financial'],
-            'Triangle Rewards': ['triangle'],
-            'WestJet Rewards': ['westjet'],
-        }
-        name_lower = name.lower()
-        for program, patterns in programs.items():
-            if any(p in name_lower for p in patterns):
-                return program
-        return "Points"
-
-    def _get_currency(self, program: str, name: str) -> str:
-        text = (program + " " + name).lower()
-        if any(x in text for x in ['aeroplan', 'air miles', 'avion', 'westjet', 'miles']):
-            return "airline_miles"
-        if any(x in text for x in ['marriott', 'hilton', 'bonvoy', 'hotel']):
-            return "hotel_points"
-        if any(x in text for x in ['cash', 'cashback', 'dividend']):
-            return "cashback"
-        return "points"
-
-    def _get_point_value(self, currency: str, program: str) -> float:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_issuer(name: str) -> str:
+        return ISSUER_MATCHER.match(name.lower(), "Other")
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_program(name: str) -> str:
+        return PROGRAM_MATCHER.match(name.lower(), "Points")
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_currency(program: str, name: str) -> str:
+        return CURRENCY_MATCHER.match((program + " " + name).lower(), "points")
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_point_value(currency: str, program: str) -> float:
         program = program.lower()
         values = {
             "cashback": 1.0, "aeroplan": 1.8, "membership rewards": 2.0,
@@ -270,184 +438,122 @@ class EnhancedCreditCardScraper:
 
 
     # =========================================================================
-    # Source 1: CreditCardGenius.ca
+    # Sources
     # =========================================================================
     def scrape_creditcardgenius(self):
         """Scrape from CreditCardGenius.ca - detailed card comparisons."""
-        print("\n[1/5] Scraping CreditCardGenius.ca...")
-        
-        urls = [
-            ("https://creditcardgenius.ca/best-credit-cards/cash-back", "cashback"),
-            ("https://creditcardgenius.ca/best-credit-cards/travel", "travel"),
-            ("https://creditcardgenius.ca/best-credit-cards/rewards", "rewards"),
-            ("https://creditcardgenius.ca/best-credit-cards/no-fee", "no-fee"),
-            ("https://creditcardgenius.ca/best-credit-cards/groceries", "groceries"),
-        ]
-        
-        count = 0
-        for url, category in urls:
-            try:
-                print(f"  Fetching: {category} cards...")
-                resp = self.session.get(url, timeout=15)
-                soup = BeautifulSoup(resp.content, 'lxml')
-                
-                # Find card containers
-                for div in soup.find_all(['div', 'article'], class_=re.compile(r'card|product', re.I)):
-                    card = self._parse_card_element(div, "creditcardgenius")
-                    if card:
-                        self._add_or_merge_card(card)
-                        count += 1
-                
-                time.sleep(self.delay)
-            except Exception as e:
-                print(f"    Error: {e}")
-        
-        print(f"  Found {count} card entries")
+        self._scrape_sources(["creditcardgenius"])
 
-    # =========================================================================
-    # Source 2: Ratehub.ca
-    # =========================================================================
     def scrape_ratehub(self):
         """Scrape from Ratehub.ca - comprehensive card database."""
-        print("\n[2/5] Scraping Ratehub.ca...")
-        
-        urls = [
-            "https://www.ratehub.ca/credit-cards/cash-back",
-            "https://www.ratehub.ca/credit-cards/travel",
-            "https://www.ratehub.ca/credit-cards/rewards",
-            "https://www.ratehub.ca/credit-cards/no-fee",
-        ]
-        
-        count = 0
-        for url in urls:
-            try:
-                print(f"  Fetching: {url.split('/')[-1]}...")
-                resp = self.session.get(url, timeout=15)
-                soup = BeautifulSoup(resp.content, 'lxml')
-                
-                for div in soup.find_all(['div', 'article'], class_=re.compile(r'card|product|listing', re.I)):
-                    card = self._parse_card_element(div, "ratehub")
-                    if card:
-                        self._add_or_merge_card(card)
-                        count += 1
-                
-                time.sleep(self.delay)
-            except Exception as e:
-                print(f"    Error: {e}")
-        
-        print(f"  Found {count} card entries")
+        self._scrape_sources(["ratehub"])
 
-    # =========================================================================
-    # Source 3: MoneySense.ca
-    # =========================================================================
     def scrape_moneysense(self):
         """Scrape from MoneySense.ca - annual card rankings."""
-        print("\n[3/5] Scraping MoneySense.ca...")
-        
-        urls = [
-            "https://www.moneysense.ca/spend/credit-cards/best-credit-cards-in-canada/",
-            "https://www.moneysense.ca/spend/credit-cards/best-cash-back-credit-cards-in-canada/",
-            "https://www.moneysense.ca/spend/credit-cards/best-travel-credit-cards-in-canada/",
-        ]
-        
-        count = 0
-        for url in urls:
-            try:
-                print(f"  Fetching article...")
-                resp = self.session.get(url, timeout=15)
-                soup = BeautifulSoup(resp.content, 'lxml')
-                
-                # Find card mentions in headings
-                for heading in soup.find_all(['h2', 'h3'], string=re.compile(r'(Visa|Mastercard|Card|Amex)', re.I)):
-                    name = heading.get_text(strip=True)
-                    name = re.sub(r'^\d+\.\s*', '', name)
-                    
-                    if len(name) > 10:
-                        card = self._create_card_from_name(name, "moneysense")
-                        if card:
-                            self._add_or_merge_card(card)
-                            count += 1
-                
-                time.sleep(self.delay)
-            except Exception as e:
-                print(f"    Error: {e}")
-        
-        print(f"  Found {count} card entries")
+        self._scrape_sources(["moneysense"])
 
-    # =========================================================================
-    # Source 4: NerdWallet Canada
-    # =========================================================================
     def scrape_nerdwallet(self):
         """Scrape from NerdWallet Canada."""
-        print("\n[4/5] Scraping NerdWallet.com/ca...")
-        
-        urls = [
-            "https://www.nerdwallet.com/ca/credit-cards/best-cash-back-credit-cards",
-            "https://www.nerdwallet.com/ca/credit-cards/best-travel-credit-cards",
-            "https://www.nerdwallet.com/ca/credit-cards/best-rewards-credit-cards",
-            "https://www.nerdwallet.com/ca/credit-cards/best-no-fee-credit-cards",
-        ]
-        
-        count = 0
-        for url in urls:
-            try:
-                print(f"  Fetching: {url.split('/')[-1]}...")
-                resp = self.session.get(url, timeout=15)
-                soup = BeautifulSoup(resp.content, 'lxml')
-                
-                for el in soup.find_all(['h2', 'h3', 'h4'], string=re.compile(r'(Visa|Mastercard|Card)', re.I)):
-                    name = el.get_text(strip=True)
-                    if 10 < len(name) < 100:
-                        card = self._create_card_from_name(name, "nerdwallet")
-                        if card:
-                            self._add_or_merge_card(card)
-                            count += 1
-                
-                time.sleep(self.delay)
-            except Exception as e:
-                print(f"    Error: {e}")
-        
-        print(f"  Found {count} card entries")
+        self._scrape_sources(["nerdwallet"])
 
-    # =========================================================================
-    # Source 5: GreedyRates.ca
-    # =========================================================================
     def scrape_greedyrates(self):
         """Scrape from GreedyRates.ca - detailed reviews."""
-        print("\n[5/5] Scraping GreedyRates.ca...")
-        
-        urls = [
-            "https://www.greedyrates.ca/blog/best-cash-back-credit-cards-canada/",
-            "https://www.greedyrates.ca/blog/best-travel-credit-cards-canada/",
-            "https://www.greedyrates.ca/blog/best-rewards-credit-cards-canada/",
-            "https://www.greedyrates.ca/blog/best-no-fee-credit-cards-canada/",
-        ]
-        
-        count = 0
-        for url in urls:
+        self._scrape_sources(["greedyrates"])
+
+    def _scrape_sources(self, sources: List[str]):
+        """
+        Fetch and parse every URL of the given sources concurrently, then merge the cards.
+        
+        The work is network-bound, so different hosts are fetched at once while each host
+        still gets one request per self.delay seconds; results are merged in source/URL order so the output doesn't depend on which response lands first.
+        """
+        jobs = []
+        with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as executor:
+            for source in sources:
+                label, urls = SCRAPE_SOURCES[source]
+                print(f"\nScraping {label}...")
+                for url in urls:
+                    print(f"  Fetching: {url.rstrip('/').split('/')[-1]}...")
+                    jobs.append((source, url, executor.submit(self._fetch_and_parse, url, source)))
+        
+        counts = dict.fromkeys(sources, 0)
+        for source, url, future in jobs:
             try:
-                print(f"  Fetching article...")
-                resp = self.session.get(url, timeout=15)
-                soup = BeautifulSoup(resp.content, 'lxml')
-                
-                for heading in soup.find_all(['h2', 'h3']):
-                    text = heading.get_text(strip=True)
-                    if any(issuer in text for issuer in ['TD', 'RBC', 'BMO', 'CIBC', 'Scotiabank', 'Amex', 'Tangerine']):
-                        name = re.sub(r'^\d+\.\s*', '', text)
-                        name = re.sub(r'\s*[-–].*$', '', name)
-                        
-                        if len(name) > 10:
-                            card = self._create_card_from_name(name, "greedyrates")
-                            if card:
-                                self._add_or_merge_card(card)
-                                count += 1
-                
-                time.sleep(self.delay)
+                cards = future.result()
             except Exception as e:
-                print(f"    Error: {e}")
-        
-        print(f"  Found {count} card entries")
-
+                print(f"    Error ({url}): {e}")
+                continue
+            for card in cards:
+                self._add_or_merge_card(card)
+            counts[source] += len(cards)
+        
+        for source in sources:
+            print(f"  {SCRAPE_SOURCES[source][0]}: found {counts[source]} card entries")
+
+    def _fetch_and_parse(self, url: str, source: str) -> List[CreditCard]:
+        """Fetch one page and parse its cards without touching self.cards."""
+        with self._host_locks[urlparse(url).hostname]:
+            resp = self.session.get(url, timeout=15)
+            time.sleep(self.delay)
+        parse_page = getattr(self, f"_parse_{source}_page")
+        if source in HEADING_SELECTORS:
+            nodes = LexborHTMLParser(resp.content).css(HEADING_SELECTORS[source])
+            return parse_page([node.text(strip=True) for node in nodes])
+        soup = BeautifulSoup(resp.content, 'lxml', parse_only=SOURCE_STRAINERS[source])
+        return parse_page(soup)
+
+    def _parse_creditcardgenius_page(self, soup) -> List[CreditCard]:
+        # Find card containers
+        cards = []
+        for div in soup.find_all(['div', 'article'], class_=CARD_CLASS_RE):
+            card = self._parse_card_element(div, "creditcardgenius")
+            if card:
+                cards.append(card)
+        return cards
+
+    def _parse_ratehub_page(self, soup) -> List[CreditCard]:
+        cards = []
+        for div in soup.find_all(['div', 'article'], class_=LISTING_CLASS_RE):
+            card = self._parse_card_element(div, "ratehub")
+            if card:
+                cards.append(card)
+        return cards
+
+    def _parse_moneysense_page(self, headings: List[str]) -> List[CreditCard]:
+        # Find card mentions in headings
+        cards = []
+        for text in headings:
+            if not CARD_HEADING_RE.search(text):
+                continue
+            name = LEADING_NUMBER_RE.sub('', text)
+            
+            if len(name) > 10:
+                card = self._create_card_from_name(name, "moneysense")
+                if card:
+                    cards.append(card)
+        return cards
+
+    def _parse_nerdwallet_page(self, headings: List[str]) -> List[CreditCard]:
+        cards = []
+        for name in headings:
+            if NETWORK_HEADING_RE.search(name) and 10 < len(name) < 100:
+                card = self._create_card_from_name(name, "nerdwallet")
+                if card:
+                    cards.append(card)
+        return cards
+
+    def _parse_greedyrates_page(self, headings: List[str]) -> List[CreditCard]:
+        cards = []
+        for text in headings:
+            if GREEDYRATES_ISSUER_RE.search(text):
+                name = LEADING_NUMBER_RE.sub('', text)
+                name = TRAILING_DASH_RE.sub('', name)
+                
+                if len(name) > 10:
+                    card = self._create_card_from_name(name, "greedyrates")
+                    if card:
+                        cards.append(card)
+        return cards
 
     # =========================================================================
     # Helper Methods
@@ -457,7 +563,7 @@ class EnhancedCreditCardScraper:
         """Parse a card from an HTML element."""
         try:
             # Find card name
-            name_el = element.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|name|heading', re.I))
+            name_el = element.find(['h2', 'h3', 'h4', 'a'], class_=TITLE_CLASS_RE)
             if not name_el:
                 name_el = element.find(['h2', 'h3', 'h4'])
             if not name_el:
@@ -467,7 +573,9 @@ class EnhancedCreditCardScraper:
             if not name or len(name) < 5:
                 return None
             
-            return self._create_card_from_name(name, source, element)
+            # Read fee/reward text from the card that holds the name, not a page-wide wrapper
+            card_scope = name_el.find_parent(['div', 'article', 'li']) or element
+            return self._create_card_from_name(name, source, card_scope)
         except:
             return None
 
@@ -481,20 +589,18 @@ class EnhancedCreditCardScraper:
         currency = self._get_currency(program, name)
         card_key = self._generate_key(name, issuer)
         
-        # Try to extract fee from element
+        # Walk the element's text once, capped so a huge container can't blow up the regex work;
+        # both the fee and the rewards are read from it
+        element_text = element.get_text()[:CARD_TEXT_LIMIT] if element else ''
+        
+        # Try to extract fee from element ("no annual fee" and no mention both leave it at 0)
         fee = 0.0
-        if element:
-            fee_text = element.get_text()
-            fee_match = re.search(r'annual fee[:\s]*\$?([\d,]+)', fee_text, re.I)
-            if fee_match:
-                fee = float(fee_match.group(1).replace(',', ''))
-            elif 'no annual fee' in fee_text.lower() or 'no fee' in fee_text.lower():
-                fee = 0.0
+        fee_match = ANNUAL_FEE_RE.search(element_text)
+        if fee_match:
+            fee = float(fee_match.group(1).replace(',', ''))
         
         # Try to extract category rewards
-        category_rewards = []
-        if element:
-            category_rewards = self._extract_category_rewards(element.get_text())
+        category_rewards = self._extract_category_rewards(element_text) if element_text else []
         
         return CreditCard(
             card_key=card_key,
@@ -521,8 +627,8 @@ class EnhancedCreditCardScraper:
                 existing.annual_fee = new_card.annual_fee
             if new_card.category_rewards and not existing.category_rewards:
                 existing.category_rewards = new_card.category_rewards
-            # Increase confidence when seen from multiple sources
-            existing.confidence = min(1.0, existing.confidence + 0.2)
+            # Seen from multiple sources; confidence is raised in finalize_confidence
+            self._merge_counts[key] = self._merge_counts.get(key, 0) + 1
             existing.source += f", {new_card.source}"
         else:
             self.cards[key] = new_card
@@ -536,24 +642,42 @@ class EnhancedCreditCardScraper:
         print("\n[Enrichment] Adding known category rewards...")
         
         enriched = 0
-        for key, rewards in KNOWN_CATEGORY_REWARDS.items():
+        for key, rewards in KNOWN_CATEGORY_REWARDS_BUILT.items():
             if key in self.cards:
                 card = self.cards[key]
                 if not card.category_rewards:
-                    card.category_rewards = [
-                        CategoryReward(
-                            category=r["category"],
-                            multiplier=r["multiplier"],
-                            reward_unit=r["unit"],
-                            description=f"{r['multiplier']}{'x' if r['unit'] == 'multiplier' else '%'} on {r['category']}"
-                        )
-                        for r in rewards
-                    ]
-                    card.confidence = min(1.0, card.confidence + 0.3)
+                    card.category_rewards = list(rewards)
+                    self._enriched_keys.add(key)
                     enriched += 1
         
         print(f"  Enriched {enriched} cards with known category rewards")
 
+    def finalize_confidence(self):
+        """
+        Apply the collected confidence bumps to every card in one vectorized pass.
+        
+        +0.2 for each extra source that listed the card and +0.3 when known category
+        rewards were filled in, capped at 1.0. verify_data calls this itself, so the
+        bumps are never lost; applied bumps are cleared, so calling it again is a no-op.
+        """
+        if not self.cards or not (self._merge_counts or self._enriched_keys):
+            return
+        keys = list(self.cards)
+        base = np.fromiter((self.cards[key].confidence for key in keys), dtype=float, count=len(keys))
+        bumps = np.fromiter(
+            (
+                0.2 * self._merge_counts.get(key, 0)
+                + (0.3 if key in self._enriched_keys else 0.0)
+                for key in keys
+            ),
+            dtype=float,
+            count=len(keys),
+        )
+        for key, confidence in zip(keys, np.minimum(1.0, base + bumps).tolist()):
+            self.cards[key].confidence = confidence
+        self._merge_counts.clear()
+        self._enriched_keys.clear()
+
     # =========================================================================
     # Data Verification
     # =========================================================================
@@ -565,56 +689,84 @@ class EnhancedCreditCardScraper:
         print("=" * 60)
         
         self.verification_results = []
-        verified = 0
         warnings = 0
         errors = 0
         
-        for key, card in self.cards.items():
+        # Merge/enrichment bumps land before the known-card bump below, as they always have
+        self.finalize_confidence()
+        
+        # Every card is verified in the same pass, so they share one timestamp
+        verified_at = datetime.now().isoformat()
+        
+        # Pull the checked fields into parallel arrays so every check runs as one mask
+        keys = list(self.cards)
+        cards = list(self.cards.values())
+        count = len(cards)
+        fees = np.fromiter((card.annual_fee for card in cards), dtype=float, count=count)
+        issuers = np.array([card.issuer for card in cards], dtype=object)
+        currencies = np.array([card.reward_currency for card in cards], dtype=object)
+        known = np.fromiter((key in KNOWN_KEYS for key in keys), dtype=bool, count=count)
+        fee_ranges = np.array([KNOWN_FEE_RANGE.get(key, (0, 0)) for key in keys], dtype=float).reshape(count, 2)
+        known_issuers = np.array([KNOWN_ISSUER.get(key) for key in keys], dtype=object)
+        max_multipliers = np.fromiter(
+            (max((cr.multiplier for cr in card.category_rewards), default=0.0) for card in cards),
+            dtype=float,
+            count=count,
+        )
+        
+        # Check 1: Valid issuer
+        unknown_issuer = issuers == "Other"
+        # Check 2: Reasonable annual fee
+        high_fee = fees > 1000
+        # Check 3: Valid reward currency
+        invalid_currency = ~np.isin(currencies, list(VALID_CURRENCIES))
+        # Check 4: Compare with known cards
+        fee_out_of_range = known & ((fees < fee_ranges[:, 0]) | (fees > fee_ranges[:, 1]))
+        issuer_mismatch = known & (issuers != known_issuers)
+        # Known cards gain confidence on every verification
+        for i in np.flatnonzero(known):
+            cards[i].confidence = min(1.0, cards[i].confidence + 0.2)
+        # Check 5: Category rewards validation
+        high_reward = max_multipliers > 10
+        
+        flagged = unknown_issuer | high_fee | invalid_currency | fee_out_of_range | issuer_mismatch | high_reward
+        
+        # Only flagged cards need their issues spelled out
+        for i in np.flatnonzero(flagged):
+            key, card = keys[i], cards[i]
             issues = []
-            
-            # Check 1: Valid issuer
-            if card.issuer == "Other":
+            if unknown_issuer[i]:
                 issues.append("Unknown issuer")
-            
-            # Check 2: Reasonable annual fee
-            if card.annual_fee > 1000:
+            if high_fee[i]:
                 issues.append(f"Unusually high fee: ${card.annual_fee}")
-            
-            # Check 3: Valid reward currency
-            if card.reward_currency not in ["cashback", "points", "airline_miles", "hotel_points"]:
+            if invalid_currency[i]:
                 issues.append(f"Invalid reward currency: {card.reward_currency}")
-            
-            # Check 4: Compare with known cards
-            if key in KNOWN_CARDS:
-                known = KNOWN_CARDS[key]
-                fee_min, fee_max = known["fee_range"]
-                if not (fee_min <= card.annual_fee <= fee_max):
-                    issues.append(f"Fee ${card.annual_fee} outside expected range ${fee_min}-${fee_max}")
-                if card.issuer != known["issuer"]:
-                    issues.append(f"Issuer mismatch: {card.issuer} vs {known['issuer']}")
-                card.confidence = min(1.0, card.confidence + 0.2)
-            
-            # Check 5: Category rewards validation
-            for cr in card.category_rewards:
-                if cr.multiplier > 10:
-                    issues.append(f"Unusually high reward rate: {cr.multiplier}x on {cr.category}")
+            if fee_out_of_range[i]:
+                fee_min, fee_max = KNOWN_FEE_RANGE[key]
+                issues.append(f"Fee ${card.annual_fee} outside expected range ${fee_min}-${fee_max}")
+            if issuer_mismatch[i]:
+                issues.append(f"Issuer mismatch: {card.issuer} vs {KNOWN_ISSUER[key]}")
+            if high_reward[i]:
+                for cr in card.category_rewards:
+                    if cr.multiplier > 10:
+                        issues.append(f"Unusually high reward rate: {cr.multiplier}x on {cr.category}")
             
             # Record results
-            if issues:
-                status = "WARNING" if len(issues) < 3 else "ERROR"
-                if status == "WARNING":
-                    warnings += 1
-                else:
-                    errors += 1
-                self.verification_results.append({
-                    "card": card.name,
-                    "key": key,
-                    "status": status,
-                    "issues": issues
-                })
+            status = "WARNING" if len(issues) < 3 else "ERROR"
+            if status == "WARNING":
+                warnings += 1
             else:
-                verified += 1
-                card.last_verified = datetime.now().isoformat()
+                errors += 1
+            self.verification_results.append({
+                "card": card.name,
+                "key": key,
+                "status": status,
+                "issues": issues
+            })
+        
+        for i in np.flatnonzero(~flagged):
+            cards[i].last_verified = verified_at
+        verified = count - int(flagged.sum())
         
         # Print summary
         print(f"\nVerification Results:")
@@ -638,33 +790,53 @@ class EnhancedCreditCardScraper:
     
     def scrape_all(self):
         """Run all scrapers."""
-        self.scrape_creditcardgenius()
-        self.scrape_ratehub()
-        self.scrape_moneysense()
-        self.scrape_nerdwallet()
-        self.scrape_greedyrates()
+        self._scrape_sources(list(SCRAPE_SOURCES))
         
         return list(self.cards.values())
 
     def save_to_json(self, filepath: str = "scraped_cards.json"):
-        """Save cards to JSON file."""
+        """Save cards to JSON file (NDJSON next to it for very large runs, see save_to_ndjson)."""
+        if len(self.cards) > NDJSON_THRESHOLD:
+            self.save_to_ndjson(os.path.splitext(filepath)[0] + ".ndjson")
+            return
+        
         output = {
             "scraped_at": datetime.now().isoformat(),
             "count": len(self.cards),
             "verification": {
                 "results": self.verification_results[:20]  # First 20 issues
             },
-            "cards": [
-                {
-                    **asdict(card),
-                    "category_rewards": [asdict(cr) for cr in card.category_rewards]
-                }
-                for card in self.cards.values()
-            ]
+            # orjson serializes the card dataclasses (and nested rewards/bonus) natively
+            "cards": list(self.cards.values()),
+        }
+        
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2, default=str))
+        
+        print(f"\nSaved to {filepath}")
+
+    def save_to_ndjson(self, filepath: str = "scraped_cards.ndjson"):
+        """
+        Save cards as newline-delimited JSON, one card per line.
+        
+        The first line holds the run metadata (scraped_at, count, verification) and
+        each card is serialized and written on its own, so the full document is never
+        held in memory at once.
+        """
+        header = {
+            "scraped_at": datetime.now().isoformat(),
+            "count": len(self.cards),
+            "verification": {
+                "results": self.verification_results[:20]  # First 20 issues
+            },
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False, default=str)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(header, default=str))
+            f.write(b"\n")
+            for card in self.cards.values():
+                f.write(orjson.dumps(card, default=str))
+                f.write(b"\n")
         
         print(f"\nSaved to {filepath}")
 
@@ -17,17 +17,9 @@ print("=" * 60)
 current = client.table('cards').select('id', count='exact').execute()
 print(f"\nCurrent cards in database: {current.count}")
 
-# Delete all category rewards first (foreign key constraint)
-print("\nDeleting all category rewards...")
-client.table('category_rewards').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
-
-# Delete all signup bonuses
-print("Deleting all signup bonuses...")
-client.table('signup_bonuses').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
-
-# Delete all cards
-print("Deleting all cards...")
-client.table('cards').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
+# Delete all category rewards, signup bonuses and cards in one round trip (reset_cards() in schema.sql)
+print("\nDeleting all category rewards, signup bonuses and cards...")
+client.rpc('reset_cards').execute()
 
 # Verify deletion
 remaining = client.table('cards').select('id', count='exact').execute()
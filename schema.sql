@@ -22,3 +22,172 @@ CREATE INDEX IF NOT EXISTS idx_scraped_articles_url ON scraped_articles(url);
 
 -- Enable Row Level Security (optional, adjust as needed)
 -- ALTER TABLE scraped_articles ENABLE ROW LEVEL SECURITY;
+
+-- Hash of each card's uploaded content; upload_cards skips cards whose hash is unchanged
+ALTER TABLE cards ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- Cards with their category reward counts, read by advanced_deduplicate.py in a single query.
+-- Dropped first because c.* changes shape whenever cards gains a column.
+-- security_invoker makes the view apply the caller's RLS policies on cards and category_rewards
+-- instead of the owner's rights, so it exposes nothing the tables themselves don't (Postgres 15+)
+DROP VIEW IF EXISTS card_dedup_v;
+CREATE VIEW card_dedup_v WITH (security_invoker = true) AS
+SELECT c.*, COUNT(cr.id) AS reward_count
+FROM cards c
+LEFT JOIN category_rewards cr ON cr.card_id = c.id
+GROUP BY c.id;
+
+-- Cascade card deletes to their rewards and bonuses so cleanup scripts only delete from cards.
+-- The existing card_id foreign keys are looked up by definition, so this works whatever they were named
+DO $$
+DECLARE
+    child TEXT;
+    fk RECORD;
+BEGIN
+    FOREACH child IN ARRAY ARRAY['category_rewards', 'signup_bonuses'] LOOP
+        FOR fk IN
+            SELECT con.conname
+            FROM pg_constraint con
+            JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = ANY (con.conkey)
+            WHERE con.contype = 'f'
+              AND con.conrelid = child::regclass
+              AND con.confrelid = 'cards'::regclass
+              AND att.attname = 'card_id'
+        LOOP
+            EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', child, fk.conname);
+        END LOOP;
+        EXECUTE format(
+            'ALTER TABLE %I ADD CONSTRAINT %I FOREIGN KEY (card_id) REFERENCES cards(id) ON DELETE CASCADE',
+            child, child || '_card_id_fkey'
+        );
+    END LOOP;
+END
+$$;
+
+-- Index for category lookups (get_cards_by_category)
+CREATE INDEX IF NOT EXISTS idx_category_rewards_category ON category_rewards(category);
+
+-- Duplicate card cleanup for deduplicate_cards.py: deletes the cards the script listed and the user
+-- confirmed (card_ids), skipping any that are no longer a duplicate of a better-scoring card for the
+-- same (issuer, normalized name), so a card can't go missing if rows changed since the preview.
+-- Returns the deleted cards. Replaces the earlier versions, which chose the cards to delete themselves
+DROP FUNCTION IF EXISTS dedupe_cards();
+DROP FUNCTION IF EXISTS dedupe_cards(BOOLEAN);
+CREATE OR REPLACE FUNCTION dedupe_cards(card_ids TEXT[])
+RETURNS TABLE (id TEXT, card_key TEXT, name TEXT)
+LANGUAGE sql
+AS $$
+    WITH scored AS (
+        SELECT
+            c.id,
+            lower(c.issuer) AS issuer_key,
+            btrim(regexp_replace(
+                regexp_replace(lower(c.name), '®|™|\*|mastercard|card|visa|best |perks of the ', '', 'g'),
+                '\s+', ' ', 'g'
+            )) AS name_key,
+            CASE WHEN EXISTS (SELECT 1 FROM category_rewards cr WHERE cr.card_id = c.id) THEN 100 ELSE 0 END
+            + CASE WHEN length(c.card_key) < 50 THEN 10 ELSE 0 END
+            + CASE WHEN c.annual_fee IS NOT NULL THEN 5 ELSE 0 END
+            + CASE WHEN c.base_reward_rate > 0 THEN 5 ELSE 0 END AS score
+        FROM cards c
+    ),
+    ranked AS (
+        SELECT
+            s.id,
+            ROW_NUMBER() OVER (PARTITION BY s.issuer_key, s.name_key ORDER BY s.score DESC, s.id) AS rn
+        FROM scored s
+    )
+    -- category_rewards and signup_bonuses rows go with their card via ON DELETE CASCADE
+    DELETE FROM cards c
+    USING ranked r
+    WHERE r.id = c.id
+      AND r.rn > 1
+      AND c.id::TEXT = ANY (card_ids)
+    RETURNING c.id::TEXT, c.card_key::TEXT, c.name::TEXT;
+$$;
+
+REVOKE EXECUTE ON FUNCTION dedupe_cards(TEXT[]) FROM PUBLIC, anon, authenticated;
+
+-- Empties all card data in one statement for reset_to_seed_data.py.
+-- Runs with the caller's privileges and is not callable with the public anon key.
+-- No CASCADE: a new table referencing cards makes this fail instead of being emptied too
+CREATE OR REPLACE FUNCTION reset_cards()
+RETURNS void
+LANGUAGE sql
+AS $$
+    TRUNCATE category_rewards, signup_bonuses, cards RESTART IDENTITY;
+$$;
+
+REVOKE EXECUTE ON FUNCTION reset_cards() FROM PUBLIC, anon, authenticated;
+
+-- Writes seed_known_cards.py's changed cards with their category rewards and signup bonuses in one
+-- transaction. Each payload element is a cards row plus a category_rewards array and a signup_bonus
+-- object (or null); the rewards and bonus of every card in the payload are replaced.
+-- Returns each written card_key and whether it was newly inserted
+CREATE OR REPLACE FUNCTION seed_cards(payload JSONB)
+RETURNS TABLE (card_key TEXT, inserted BOOLEAN)
+LANGUAGE sql
+AS $$
+    WITH upserted AS (
+        INSERT INTO cards AS c (
+            card_key, name, issuer, reward_program, reward_currency, point_valuation,
+            annual_fee, base_reward_rate, base_reward_unit, is_active, content_hash
+        )
+        SELECT
+            r.card_key, r.name, r.issuer, r.reward_program, r.reward_currency, r.point_valuation,
+            r.annual_fee, r.base_reward_rate, r.base_reward_unit, r.is_active, r.content_hash
+        FROM jsonb_populate_recordset(NULL::cards, payload) r
+        ON CONFLICT (card_key) DO UPDATE SET
+            name = EXCLUDED.name,
+            issuer = EXCLUDED.issuer,
+            reward_program = EXCLUDED.reward_program,
+            reward_currency = EXCLUDED.reward_currency,
+            point_valuation = EXCLUDED.point_valuation,
+            annual_fee = EXCLUDED.annual_fee,
+            base_reward_rate = EXCLUDED.base_reward_rate,
+            base_reward_unit = EXCLUDED.base_reward_unit,
+            is_active = EXCLUDED.is_active,
+            content_hash = EXCLUDED.content_hash
+        RETURNING c.id, c.card_key, (c.xmax = 0) AS inserted
+    ),
+    seeded AS (
+        SELECT u.id, card
+        FROM jsonb_array_elements(payload) card
+        JOIN upserted u ON u.card_key = card->>'card_key'
+    ),
+    -- Old rows are removed by id; the statement snapshot keeps the new rows below out of these deletes
+    cleared_rewards AS (
+        DELETE FROM category_rewards cr USING upserted u WHERE cr.card_id = u.id
+    ),
+    cleared_bonuses AS (
+        DELETE FROM signup_bonuses sb USING upserted u WHERE sb.card_id = u.id
+    ),
+    new_rewards AS (
+        INSERT INTO category_rewards (card_id, category, multiplier, reward_unit, description)
+        SELECT s.id, r.category, r.multiplier, r.reward_unit, r.description
+        FROM seeded s, jsonb_populate_recordset(NULL::category_rewards, s.card->'category_rewards') r
+    ),
+    new_bonuses AS (
+        INSERT INTO signup_bonuses (card_id, bonus_amount, bonus_currency, spend_requirement, timeframe_days, is_active)
+        SELECT s.id, b.bonus_amount, b.bonus_currency, b.spend_requirement, b.timeframe_days, TRUE
+        FROM seeded s, jsonb_populate_record(NULL::signup_bonuses, NULLIF(s.card->'signup_bonus', 'null')) b
+        WHERE jsonb_typeof(s.card->'signup_bonus') = 'object'
+    )
+    SELECT u.card_key::TEXT, u.inserted FROM upserted u;
+$$;
+
+REVOKE EXECUTE ON FUNCTION seed_cards(JSONB) FROM PUBLIC, anon, authenticated;
+
+-- Stores the content hashes of cards credit_card_uploader.py has fully written (row, rewards and
+-- bonus) in one UPDATE; hashes maps card_key to content_hash
+CREATE OR REPLACE FUNCTION set_card_hashes(hashes JSONB)
+RETURNS void
+LANGUAGE sql
+AS $$
+    UPDATE cards c
+    SET content_hash = h.value
+    FROM jsonb_each_text(hashes) h
+    WHERE c.card_key = h.key;
+$$;
+
+REVOKE EXECUTE ON FUNCTION set_card_hashes(JSONB) FROM PUBLIC, anon, authenticated;
@@ -5,20 +5,115 @@ No user input required - just run it.
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
-import time
+from selectolax.lexbor import LexborHTMLParser
+import orjson
 import re
+import threading
+import time
+from urllib.parse import urlparse
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import os
 from dotenv import load_dotenv
+from credit_card_scraper import KeywordMatcher
 
 load_dotenv()
 
+# CreditCardGenius card containers and their title elements, matched on class substrings
+CARD_CONTAINER_SELECTOR = 'div[class*="card-item"], div[class*="product-card"], div[class*="credit-card"]'
+CARD_TITLE_SELECTOR = ', '.join(
+    f'{tag}[class*="{cls}"]' for tag in ('h2', 'h3', 'h4', 'a') for cls in ('title', 'name', 'heading')
+)
+
+# Key cleanup: drop anything but letters, digits, whitespace and dashes, then collapse separators
+KEY_INVALID_RE = re.compile(r'[^a-z0-9\s-]')
+KEY_SEPARATOR_RE = re.compile(r'[\s-]+')
+
+# Fee and reward rate amounts
+FEE_AMOUNT_RE = re.compile(r'\$?([\d,]+(?:\.\d{2})?)')
+MULTIPLIER_RATE_RE = re.compile(r'([\d.]+)\s*x')
+PERCENT_RATE_RE = re.compile(r'([\d.]+)\s*%')
+NUMBER_RE = re.compile(r'([\d.]+)')
+
+# Page text matched while scraping
+# Annual fee label, with a leading "no" captured so "No annual fee" isn't read as the next number on the card
+FEE_LABEL_RE = re.compile(r'(\bno\s+)?(?:annual fee|yearly)', re.I)
+# Characters after the fee label searched for the fee amount
+FEE_WINDOW = 64
+ISSUER_HEADING_RE = re.compile(r'(TD|RBC|BMO|CIBC|Scotiabank|Amex|MBNA|Tangerine|Simplii)', re.I)
+NETWORK_HEADING_RE = re.compile(r'(Visa|Mastercard|Card)', re.I)
+LEADING_NUMBER_RE = re.compile(r'^\d+\.\s*')
+TRAILING_DASH_RE = re.compile(r'\s*[-–]\s*.*$')
+
+# Name keywords in priority order; each matcher scans a name once for all of its keywords
+ISSUER_MATCHER = KeywordMatcher([
+    ('td ', 'TD'), ('rbc ', 'RBC'), ('bmo ', 'BMO'), ('cibc ', 'CIBC'),
+    ('scotiabank', 'Scotiabank'), ('scotia ', 'Scotiabank'),
+    ('amex', 'American Express'), ('american express', 'American Express'),
+    ('mbna', 'MBNA'), ('capital one', 'Capital One'),
+    ('tangerine', 'Tangerine'), ('simplii', 'Simplii'),
+    ('pc ', 'PC Financial'), ('hsbc', 'HSBC'),
+    ('national bank', 'National Bank'), ('desjardins', 'Desjardins'),
+])
+
+PROGRAM_MATCHER = KeywordMatcher([
+    ('aeroplan', 'Aeroplan'), ('scene', 'Scene+'),
+    ('air miles', 'Air Miles'), ('avion', 'Avion'),
+    ('td rewards', 'TD Rewards'), ('bmo rewards', 'BMO Rewards'),
+    ('aventura', 'Aventura'),
+    ('cobalt', 'Membership Rewards'), ('gold', 'Membership Rewards'), ('platinum', 'Membership Rewards'),
+    ('cash back', 'Cashback'), ('cashback', 'Cashback'), ('pc optimum', 'PC Optimum'),
+    ('triangle', 'Triangle Rewards'), ('westjet', 'WestJet Rewards'),
+])
+
+CURRENCY_MATCHER = KeywordMatcher([
+    ('aeroplan', 'airline_miles'), ('air miles', 'airline_miles'), ('avion', 'airline_miles'),
+    ('westjet', 'airline_miles'), ('miles', 'airline_miles'),
+    ('marriott', 'hotel_points'), ('hilton', 'hotel_points'), ('bonvoy', 'hotel_points'), ('hotel', 'hotel_points'),
+    ('cash', 'cashback'), ('cashback', 'cashback'),
+])
 
-@dataclass
+# Source -> (label, listing URLs); every URL is fetched concurrently
+SCRAPE_SOURCES = {
+    'creditcardgenius': ("CreditCardGenius.ca", [
+        "https://creditcardgenius.ca/best-credit-cards/cash-back",
+        "https://creditcardgenius.ca/best-credit-cards/travel",
+        "https://creditcardgenius.ca/best-credit-cards/rewards",
+        "https://creditcardgenius.ca/best-credit-cards/no-fee",
+    ]),
+    'greedyrates': ("GreedyRates.ca", [
+        "https://www.greedyrates.ca/blog/best-cash-back-credit-cards-canada/",
+        "https://www.greedyrates.ca/blog/best-travel-credit-cards-canada/",
+        "https://www.greedyrates.ca/blog/best-rewards-credit-cards-canada/",
+    ]),
+    'nerdwallet': ("NerdWallet.com/ca", [
+        "https://www.nerdwallet.com/ca/credit-cards/best-cash-back-credit-cards",
+        "https://www.nerdwallet.com/ca/credit-cards/best-travel-credit-cards",
+        "https://www.nerdwallet.com/ca/credit-cards/best-rewards-credit-cards",
+    ]),
+}
+
+# Article sources only read heading text, so only these headings are kept from their pages
+HEADING_SELECTORS = {
+    'greedyrates': 'h2, h3',
+    'nerdwallet': 'h2, h3, h4',
+}
+
+# Pages fetched at once across hosts (each host is still fetched one page at a time)
+SCRAPE_WORKERS = 10
+# Seconds a cached page stays fresh when SCRAPE_CACHE=1
+SCRAPE_CACHE_TTL = 3600
+
+# Rows per upsert request, to stay under PostgREST payload limits
+UPSERT_BATCH_SIZE = 500
+# Keys per in.(...) filter, kept small enough to stay under URL length limits
+FILTER_BATCH_SIZE = 200
+
+
+@dataclass(slots=True)
 class CategoryReward:
     category: str
     multiplier: float
@@ -30,7 +125,7 @@ class CategoryReward:
     spend_limit_period: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SignupBonus:
     bonus_amount: int
     bonus_currency: str
@@ -39,7 +134,7 @@ class SignupBonus:
     valid_until: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CreditCard:
     card_key: str
     name: str
@@ -65,7 +160,19 @@ class CreditCardWebScraper:
     """Scrapes credit card data from Canadian financial websites."""
     
     def __init__(self):
-        self.session = requests.Session()
+        if os.getenv('SCRAPE_CACHE') == '1':
+            # Development runs reuse pages fetched within the last hour from an on-disk cache
+            import requests_cache
+            self.session = requests_cache.CachedSession(
+                'scrape_cache',
+                backend='sqlite',
+                expire_after=SCRAPE_CACHE_TTL,
+                allowable_codes=(200,),
+                allowable_methods=('GET',),
+                stale_if_error=True,
+            )
+        else:
+            self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -73,14 +180,11 @@ class CreditCardWebScraper:
         })
         self.cards = []
         self.delay = 2.0
-
-    def _generate_card_key(self, name: str, issuer: str) -> str:
-        combined = f"{issuer}-{name}"
-        key = combined.lower()
-        key = re.sub(r'[^a-z0-9\s-]', '', key)
-        key = re.sub(r'\s+', '-', key)
-        key = re.sub(r'-+', '-', key)
-        return key.strip('-')[:100]
+        # One fetch at a time per host, so concurrency spreads across sites instead of hammering one
+        self._host_locks = {
+            urlparse(url).hostname: threading.Semaphore(1)
+            for _, urls in SCRAPE_SOURCES.values() for url in urls
+        }
 
     def _parse_fee(self, text: str) -> float:
         if not text:
@@ -88,33 +192,25 @@ class CreditCardWebScraper:
         text = text.lower().strip()
         if 'no' in text or 'free' in text or '$0' in text:
             return 0.0
-        match = re.search(r'\$?([\d,]+(?:\.\d{2})?)', text)
+        match = FEE_AMOUNT_RE.search(text)
         return float(match.group(1).replace(',', '')) if match else 0.0
 
     def _parse_rate(self, text: str) -> tuple:
         if not text:
             return (1.0, "percent")
         text = text.lower()
-        match = re.search(r'([\d.]+)\s*x', text)
+        match = MULTIPLIER_RATE_RE.search(text)
         if match:
             return (float(match.group(1)), "multiplier")
-        match = re.search(r'([\d.]+)\s*%', text)
+        match = PERCENT_RATE_RE.search(text)
         if match:
             return (float(match.group(1)), "percent")
-        match = re.search(r'([\d.]+)', text)
+        match = NUMBER_RE.search(text)
         return (float(match.group(1)), "percent") if match else (1.0, "percent")
 
-    def _get_reward_currency(self, program: str, name: str) -> str:
-        text = (program + " " + name).lower()
-        if any(x in text for x in ['aeroplan', 'air miles', 'avion', 'westjet', 'miles']):
-            return "airline_miles"
-        if any(x in text for x in ['marriott', 'hilton', 'bonvoy', 'hotel']):
-            return "hotel_points"
-        if any(x in text for x in ['cash', 'cashback']):
-            return "cashback"
-        return "points"
-
-    def _get_point_value(self, currency: str, program: str) -> float:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_point_value(currency: str, program: str) -> float:
         program = program.lower()
         if currency == "cashback":
             return 1.0
@@ -128,243 +224,208 @@ class CreditCardWebScraper:
             return 1.5
         return 1.0
 
-    def _extract_issuer(self, name: str) -> str:
-        issuers = {
-            'TD': ['td '], 'RBC': ['rbc '], 'BMO': ['bmo '],
-            'CIBC': ['cibc '], 'Scotiabank': ['scotiabank', 'scotia '],
-            'American Express': ['amex', 'american express'],
-            'MBNA': ['mbna'], 'Capital One': ['capital one'],
-            'Tangerine': ['tangerine'], 'Simplii': ['simplii'],
-            'PC Financial': ['pc '], 'HSBC': ['hsbc'],
-            'National Bank': ['national bank'], 'Desjardins': ['desjardins'],
-        }
-        name_lower = name.lower()
-        for issuer, patterns in issuers.items():
-            if any(p in name_lower for p in patterns):
-                return issuer
-        return "Other"
-
-    def _extract_program(self, name: str) -> str:
-        programs = {
-            'Aeroplan': ['aeroplan'], 'Scene+': ['scene'],
-            'Air Miles': ['air miles'], 'Avion': ['avion'],
-            'TD Rewards': ['td rewards'], 'BMO Rewards': ['bmo rewards'],
-            'Aventura': ['aventura'], 'Membership Rewards': ['cobalt', 'gold', 'platinum'],
-            'Cashback': ['cash back', 'cashback'], 'PC Optimum': ['pc optimum'],
-            'Triangle Rewards': ['triangle'], 'WestJet Rewards': ['westjet'],
-        }
-        name_lower = name.lower()
-        for program, patterns in programs.items():
-            if any(p in name_lower for p in patterns):
-                return program
-        return "Points"
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _derive(name: str) -> tuple:
+        """
+        Derive everything a card takes from its name in one pass over the lowercased name.
+        
+        Returns:
+            (issuer, program, currency, card_key, point_valuation)
+        """
+        low = name.lower()
+        issuer = ISSUER_MATCHER.match(low, "Other")
+        program = PROGRAM_MATCHER.match(low, "Points")
+        currency = CURRENCY_MATCHER.match(f"{program.lower()} {low}", "points")
+        key = KEY_SEPARATOR_RE.sub('-', KEY_INVALID_RE.sub('', f"{issuer.lower()}-{low}"))
+        point_value = CreditCardWebScraper._get_point_value(currency, program)
+        return issuer, program, currency, key.strip('-')[:100], point_value
 
 
     def scrape_creditcardgenius(self) -> list:
         """Scrape from CreditCardGenius.ca - Canadian credit card comparison site."""
-        print("\n[1/3] Scraping CreditCardGenius.ca...")
-        cards = []
+        return self._scrape_sources(['creditcardgenius'])['creditcardgenius']
+
+    def scrape_greedyrates(self) -> list:
+        """Scrape from GreedyRates.ca - Canadian credit card reviews."""
+        return self._scrape_sources(['greedyrates'])['greedyrates']
+
+    def scrape_nerdwallet(self) -> list:
+        """Scrape from NerdWallet Canada."""
+        return self._scrape_sources(['nerdwallet'])['nerdwallet']
+
+    def _scrape_sources(self, sources: list) -> dict:
+        """
+        Fetch and parse every URL of the given sources concurrently.
         
-        urls = [
-            "https://creditcardgenius.ca/best-credit-cards/cash-back",
-            "https://creditcardgenius.ca/best-credit-cards/travel",
-            "https://creditcardgenius.ca/best-credit-cards/rewards",
-            "https://creditcardgenius.ca/best-credit-cards/no-fee",
-        ]
+        Different hosts are fetched at once while each host still gets one request per
+        self.delay seconds. Pages are merged back in source/URL order, so each source's
+        card list is the same as fetching its pages one after another.
+        """
+        jobs = []
+        with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as executor:
+            for source in sources:
+                label, urls = SCRAPE_SOURCES[source]
+                print(f"\nScraping {label}...")
+                for url in urls:
+                    print(f"  Fetching: {url}")
+                    jobs.append((source, url, executor.submit(self._fetch_and_parse, url, source)))
         
-        for url in urls:
+        results = {source: [] for source in sources}
+        seen_keys = {source: set() for source in sources}
+        for source, url, future in jobs:
             try:
-                print(f"  Fetching: {url}")
-                resp = self.session.get(url, timeout=15)
-                resp.raise_for_status()
-                soup = BeautifulSoup(resp.content, 'lxml')
-                
-                # Find card containers
-                card_divs = soup.find_all('div', class_=re.compile(r'card-item|product-card|credit-card'))
-                
-                for div in card_divs:
-                    try:
-                        # Try to find card name
-                        name_el = div.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|name|heading'))
-                        if not name_el:
-                            name_el = div.find(['h2', 'h3', 'h4'])
-                        if not name_el:
-                            continue
-                        
-                        name = name_el.get_text(strip=True)
-                        if not name or len(name) < 5:
-                            continue
-                        
-                        issuer = self._extract_issuer(name)
-                        program = self._extract_program(name)
-                        currency = self._get_reward_currency(program, name)
-                        
-                        # Try to find annual fee
-                        fee = 0.0
-                        fee_el = div.find(string=re.compile(r'annual fee|yearly', re.I))
-                        if fee_el:
-                            fee = self._parse_fee(fee_el.parent.get_text() if fee_el.parent else str(fee_el))
-                        
-                        card = CreditCard(
-                            card_key=self._generate_card_key(name, issuer),
-                            name=name,
-                            issuer=issuer,
-                            reward_program=program,
-                            reward_currency=currency,
-                            point_valuation=self._get_point_value(currency, program),
-                            annual_fee=fee,
-                            base_reward_rate=1.0,
-                        )
-                        
-                        if card.card_key not in [c.card_key for c in cards]:
-                            cards.append(card)
-                            
-                    except Exception as e:
-                        continue
-                
-                time.sleep(self.delay)
-                
+                page_cards = future.result()
             except Exception as e:
-                print(f"  Error: {e}")
+                print(f"  Error ({url}): {e}")
+                continue
+            for card in page_cards:
+                if card.card_key not in seen_keys[source]:
+                    results[source].append(card)
+                    seen_keys[source].add(card.card_key)
         
-        print(f"  Found {len(cards)} cards")
-        return cards
+        for source in sources:
+            print(f"  {SCRAPE_SOURCES[source][0]}: found {len(results[source])} cards")
+        return results
 
-    def scrape_greedyrates(self) -> list:
-        """Scrape from GreedyRates.ca - Canadian credit card reviews."""
-        print("\n[2/3] Scraping GreedyRates.ca...")
+    def _fetch_and_parse(self, url: str, source: str) -> list:
+        """Fetch one page and parse its cards."""
+        with self._host_locks[urlparse(url).hostname]:
+            resp = self.session.get(url, timeout=15)
+            time.sleep(self.delay)
+        resp.raise_for_status()
+        parse_page = getattr(self, f"_parse_{source}_page")
+        if source in HEADING_SELECTORS:
+            # Only the heading texts outlive the parse, so the page tree is freed before cards are built
+            nodes = LexborHTMLParser(resp.content).css(HEADING_SELECTORS[source])
+            headings = [node.text(strip=True) for node in nodes]
+            del nodes
+            return parse_page(headings)
+        return parse_page(LexborHTMLParser(resp.content))
+
+    def _parse_creditcardgenius_page(self, tree) -> list:
         cards = []
+        seen_keys = set()
         
-        urls = [
-            "https://www.greedyrates.ca/blog/best-cash-back-credit-cards-canada/",
-            "https://www.greedyrates.ca/blog/best-travel-credit-cards-canada/",
-            "https://www.greedyrates.ca/blog/best-rewards-credit-cards-canada/",
-        ]
-        
-        for url in urls:
+        # Find card containers
+        for div in tree.css(CARD_CONTAINER_SELECTOR):
             try:
-                print(f"  Fetching: {url}")
-                resp = self.session.get(url, timeout=15)
-                resp.raise_for_status()
-                soup = BeautifulSoup(resp.content, 'lxml')
+                # Try to find card name
+                name_el = div.css_first(CARD_TITLE_SELECTOR)
+                if not name_el:
+                    name_el = div.css_first('h2, h3, h4')
+                if not name_el:
+                    continue
                 
-                # Find card mentions in article
-                headings = soup.find_all(['h2', 'h3'], string=re.compile(r'(TD|RBC|BMO|CIBC|Scotiabank|Amex|MBNA|Tangerine|Simplii)', re.I))
+                name = name_el.text(strip=True)
+                if not name or len(name) < 5:
+                    continue
                 
-                for heading in headings:
-                    try:
-                        name = heading.get_text(strip=True)
-                        # Clean up the name
-                        name = re.sub(r'^\d+\.\s*', '', name)  # Remove numbering
-                        name = re.sub(r'\s*[-–]\s*.*$', '', name)  # Remove trailing descriptions
-                        
-                        if len(name) < 10:
-                            continue
-                        
-                        issuer = self._extract_issuer(name)
-                        program = self._extract_program(name)
-                        currency = self._get_reward_currency(program, name)
-                        
-                        card = CreditCard(
-                            card_key=self._generate_card_key(name, issuer),
-                            name=name,
-                            issuer=issuer,
-                            reward_program=program,
-                            reward_currency=currency,
-                            point_valuation=self._get_point_value(currency, program),
-                            annual_fee=0.0,
-                            base_reward_rate=1.0,
-                        )
-                        
-                        if card.card_key not in [c.card_key for c in cards]:
-                            cards.append(card)
-                            
-                    except Exception:
-                        continue
+                issuer, program, currency, key, point_value = self._derive(name)
+                if key in seen_keys:
+                    continue
                 
-                time.sleep(self.delay)
+                # Try to find annual fee in the text right after its label
+                fee = 0.0
+                text = div.text(separator=' ', strip=True)
+                fee_label = FEE_LABEL_RE.search(text)
+                if fee_label and not fee_label.group(1):
+                    fee = self._parse_fee(text[fee_label.start():fee_label.start() + FEE_WINDOW])
                 
+                cards.append(CreditCard(
+                    card_key=key,
+                    name=name,
+                    issuer=issuer,
+                    reward_program=program,
+                    reward_currency=currency,
+                    point_valuation=point_value,
+                    annual_fee=fee,
+                    base_reward_rate=1.0,
+                ))
+                seen_keys.add(key)
+                    
             except Exception as e:
-                print(f"  Error: {e}")
-        
-        print(f"  Found {len(cards)} cards")
+                continue
         return cards
 
-
-    def scrape_nerdwallet(self) -> list:
-        """Scrape from NerdWallet Canada."""
-        print("\n[3/3] Scraping NerdWallet.com/ca...")
+    def _parse_greedyrates_page(self, headings: list) -> list:
         cards = []
+        seen_keys = set()
         
-        urls = [
-            "https://www.nerdwallet.com/ca/credit-cards/best-cash-back-credit-cards",
-            "https://www.nerdwallet.com/ca/credit-cards/best-travel-credit-cards",
-            "https://www.nerdwallet.com/ca/credit-cards/best-rewards-credit-cards",
-        ]
-        
-        for url in urls:
+        # Find card mentions in article
+        for name in headings:
             try:
-                print(f"  Fetching: {url}")
-                resp = self.session.get(url, timeout=15)
-                resp.raise_for_status()
-                soup = BeautifulSoup(resp.content, 'lxml')
-                
-                # Find card names in the page
-                card_elements = soup.find_all(['h2', 'h3', 'h4'], string=re.compile(r'(Visa|Mastercard|Card)', re.I))
+                if not ISSUER_HEADING_RE.search(name):
+                    continue
+                # Clean up the name
+                name = LEADING_NUMBER_RE.sub('', name)  # Remove numbering
+                name = TRAILING_DASH_RE.sub('', name)  # Remove trailing descriptions
                 
-                for el in card_elements:
-                    try:
-                        name = el.get_text(strip=True)
-                        if len(name) < 10 or len(name) > 100:
-                            continue
-                        
-                        issuer = self._extract_issuer(name)
-                        if issuer == "Other":
-                            continue
-                            
-                        program = self._extract_program(name)
-                        currency = self._get_reward_currency(program, name)
-                        
-                        card = CreditCard(
-                            card_key=self._generate_card_key(name, issuer),
-                            name=name,
-                            issuer=issuer,
-                            reward_program=program,
-                            reward_currency=currency,
-                            point_valuation=self._get_point_value(currency, program),
-                            annual_fee=0.0,
-                            base_reward_rate=1.0,
-                        )
-                        
-                        if card.card_key not in [c.card_key for c in cards]:
-                            cards.append(card)
-                            
-                    except Exception:
-                        continue
+                if len(name) < 10:
+                    continue
                 
-                time.sleep(self.delay)
+                issuer, program, currency, key, point_value = self._derive(name)
+                if key in seen_keys:
+                    continue
                 
-            except Exception as e:
-                print(f"  Error: {e}")
+                cards.append(CreditCard(
+                    card_key=key,
+                    name=name,
+                    issuer=issuer,
+                    reward_program=program,
+                    reward_currency=currency,
+                    point_valuation=point_value,
+                    annual_fee=0.0,
+                    base_reward_rate=1.0,
+                ))
+                seen_keys.add(key)
+                    
+            except Exception:
+                continue
+        return cards
+
+    def _parse_nerdwallet_page(self, headings: list) -> list:
+        cards = []
+        seen_keys = set()
         
-        print(f"  Found {len(cards)} cards")
+        # Find card names in the page
+        for name in headings:
+            try:
+                if not NETWORK_HEADING_RE.search(name):
+                    continue
+                if len(name) < 10 or len(name) > 100:
+                    continue
+                
+                issuer, program, currency, key, point_value = self._derive(name)
+                if issuer == "Other" or key in seen_keys:
+                    continue
+                
+                cards.append(CreditCard(
+                    card_key=key,
+                    name=name,
+                    issuer=issuer,
+                    reward_program=program,
+                    reward_currency=currency,
+                    point_valuation=point_value,
+                    annual_fee=0.0,
+                    base_reward_rate=1.0,
+                ))
+                seen_keys.add(key)
+                    
+            except Exception:
+                continue
         return cards
 
     def scrape_all(self) -> list:
-        """Scrape from all sources."""
+        """Scrape from all sources, fetching every source's pages at once."""
         all_cards = []
         seen_keys = set()
         
-        # Scrape each source
-        for scrape_func in [self.scrape_creditcardgenius, self.scrape_greedyrates, self.scrape_nerdwallet]:
-            try:
-                cards = scrape_func()
-                for card in cards:
-                    if card.card_key not in seen_keys:
-                        all_cards.append(card)
-                        seen_keys.add(card.card_key)
-            except Exception as e:
-                print(f"  Source error: {e}")
+        for cards in self._scrape_sources(list(SCRAPE_SOURCES)).values():
+            for card in cards:
+                if card.card_key not in seen_keys:
+                    all_cards.append(card)
+                    seen_keys.add(card.card_key)
         
         self.cards = all_cards
         return all_cards
@@ -383,36 +444,47 @@ def upload_to_supabase(cards: list) -> dict:
     client = create_client(url, key)
     results = {'inserted': 0, 'updated': 0, 'errors': []}
     
-    for card in cards:
+    # One row per card_key (last one wins); Postgres rejects an upsert that touches a row twice
+    rows = list({
+        card.card_key: {
+            'card_key': card.card_key,
+            'name': card.name,
+            'name_fr': card.name_fr,
+            'issuer': card.issuer,
+            'reward_program': card.reward_program,
+            'reward_currency': card.reward_currency,
+            'point_valuation': card.point_valuation,
+            'annual_fee': card.annual_fee,
+            'base_reward_rate': card.base_reward_rate,
+            'base_reward_unit': card.base_reward_unit,
+            'image_url': card.image_url,
+            'apply_url': card.apply_url,
+            'is_active': True,
+            # This upload doesn't write rewards/bonuses, so clear the hash credit_card_uploader
+            # uses to skip unchanged cards; its next run rewrites these cards in full
+            'content_hash': None,
+        }
+        for card in cards
+    }.values())
+    
+    # Look up which cards already exist in a few in.(...) queries, only to report inserted vs updated
+    existing_keys = set()
+    for i in range(0, len(rows), FILTER_BATCH_SIZE):
+        batch_keys = [row['card_key'] for row in rows[i:i + FILTER_BATCH_SIZE]]
+        existing = client.table('cards').select('card_key').in_('card_key', batch_keys).execute()
+        existing_keys.update(row['card_key'] for row in existing.data)
+    
+    # Insert-or-update in batches with ON CONFLICT (card_key) instead of a select plus write per card
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        batch = rows[i:i + UPSERT_BATCH_SIZE]
         try:
-            card_data = {
-                'card_key': card.card_key,
-                'name': card.name,
-                'name_fr': card.name_fr,
-                'issuer': card.issuer,
-                'reward_program': card.reward_program,
-                'reward_currency': card.reward_currency,
-                'point_valuation': card.point_valuation,
-                'annual_fee': card.annual_fee,
-                'base_reward_rate': card.base_reward_rate,
-                'base_reward_unit': card.base_reward_unit,
-                'image_url': card.image_url,
-                'apply_url': card.apply_url,
-                'is_active': True,
-            }
-            
-            # Check if exists
-            existing = client.table('cards').select('id').eq('card_key', card.card_key).execute()
-            
-            if existing.data:
-                client.table('cards').update(card_data).eq('card_key', card.card_key).execute()
-                results['updated'] += 1
-            else:
-                client.table('cards').insert(card_data).execute()
-                results['inserted'] += 1
-                
+            client.table('cards').upsert(batch, on_conflict='card_key', returning='minimal').execute()
         except Exception as e:
-            results['errors'].append({'card': card.card_key, 'error': str(e)})
+            results['errors'].extend({'card': row['card_key'], 'error': str(e)} for row in batch)
+            continue
+        updated = sum(row['card_key'] in existing_keys for row in batch)
+        results['updated'] += updated
+        results['inserted'] += len(batch) - updated
     
     return results
 
@@ -443,10 +515,11 @@ def main():
         output = {
             'scraped_at': datetime.now().isoformat(),
             'count': len(cards),
-            'cards': [asdict(c) for c in cards]
+            # orjson serializes the card dataclasses (and nested rewards/bonus) natively
+            'cards': cards,
         }
-        with open('scraped_cards.json', 'w') as f:
-            json.dump(output, f, indent=2, default=str)
+        with open('scraped_cards.json', 'wb') as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2, default=str))
         print(f"\nSaved to scraped_cards.json")
         
         # Upload to Supabase
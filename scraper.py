@@ -3,15 +3,28 @@ Generic Web Scraper - Scrapes public websites, blogs, and articles based on topi
 """
 
 import requests
-from bs4 import BeautifulSoup
-from newspaper import Article
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
+import trafilatura
 from googlesearch import search
-import pandas as pd
-import json
-import time
+import orjson
 from datetime import datetime
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 import re
+import os
+import csv
+
+# Pages scraped at once by scrape_topic
+SCRAPE_WORKERS = 8
+# Retry transient failures (rate limits, 5xx) with backoff; only GETs are retried
+FETCH_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504], allowed_methods=['GET'])
+# Seconds a cached page stays fresh when SCRAPE_CACHE=1
+SCRAPE_CACHE_TTL = 3600
+# Brave Search API endpoint (used by search_topic when BRAVE_API_KEY is set) and its max results per request
+BRAVE_SEARCH_URL = 'https://api.search.brave.com/res/v1/web/search'
+BRAVE_PAGE_SIZE = 20
 
 
 class WebScraper:
@@ -28,11 +41,32 @@ class WebScraper:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        # One pooled session so repeat requests to a host reuse its keep-alive connection
+        if os.getenv('SCRAPE_CACHE') == '1':
+            # Development runs reuse pages fetched within the last hour from an on-disk cache
+            import requests_cache
+            self.session = requests_cache.CachedSession(
+                'scrape_cache',
+                backend='sqlite',
+                expire_after=SCRAPE_CACHE_TTL,
+                allowable_codes=(200,),
+                allowable_methods=('GET',),
+                stale_if_error=True,
+            )
+        else:
+            self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=SCRAPE_WORKERS, pool_maxsize=SCRAPE_WORKERS, max_retries=FETCH_RETRY)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.results = []
 
     def search_topic(self, topic: str, num_results: int = 10) -> list[str]:
         """
-        Search for URLs related to a topic using Google.
+        Search for URLs related to a topic.
+        
+        Uses the Brave Search API when BRAVE_API_KEY is set (one JSON request per
+        20 results); otherwise scrapes Google's result pages with googlesearch.
         
         Args:
             topic: The topic to search for
@@ -44,16 +78,39 @@ class WebScraper:
         print(f"Searching for: {topic}")
         urls = []
         try:
-            for url in search(topic, num_results=num_results):
-                urls.append(url)
-                time.sleep(self.delay)
+            api_key = os.getenv('BRAVE_API_KEY')
+            if api_key:
+                urls = self._search_brave(topic, num_results, api_key)
+            else:
+                # googlesearch waits `delay` between its own result-page requests
+                for url in search(topic, num_results=num_results, sleep_interval=self.delay):
+                    urls.append(url)
         except Exception as e:
             print(f"Search error: {e}")
         return urls
 
+    def _search_brave(self, topic: str, num_results: int, api_key: str) -> list[str]:
+        """Fetch result URLs from the Brave Search API on the pooled session."""
+        count = min(num_results, BRAVE_PAGE_SIZE)
+        urls = []
+        # Brave's offset counts pages of `count` results
+        for offset in range(-(-num_results // count)):
+            response = self.session.get(
+                BRAVE_SEARCH_URL,
+                params={'q': topic, 'count': count, 'offset': offset},
+                headers={'X-Subscription-Token': api_key, 'Accept': 'application/json'},
+                timeout=10,
+            )
+            response.raise_for_status()
+            results = response.json().get('web', {}).get('results', [])
+            urls.extend(result['url'] for result in results)
+            if len(results) < count:
+                break
+        return urls[:num_results]
+
     def scrape_article(self, url: str) -> Optional[dict]:
         """
-        Scrape content from a single article/webpage using newspaper3k.
+        Scrape content from a single article/webpage using trafilatura.
         
         Args:
             url: The URL to scrape
@@ -62,18 +119,26 @@ class WebScraper:
             Dictionary with article data or None if failed
         """
         try:
-            article = Article(url)
-            article.download()
-            article.parse()
+            # Fetch on the pooled session, then extract the main text and metadata from the HTML
+            response = self.session.get(url, timeout=15)
+            response.raise_for_status()
+            # Raw bytes let trafilatura detect the page encoding itself
+            document = trafilatura.bare_extraction(
+                response.content, url=url, with_metadata=True, favor_precision=True
+            )
+            if document is None:
+                raise ValueError("no article content found")
+            article = document.as_dict()
             
+            text = article.get('text') or ''
             return {
                 'url': url,
-                'title': article.title,
-                'authors': article.authors,
-                'publish_date': str(article.publish_date) if article.publish_date else None,
-                'text': article.text,
-                'summary': article.text[:500] + '...' if len(article.text) > 500 else article.text,
-                'top_image': article.top_image,
+                'title': article.get('title'),
+                'authors': article['author'].split('; ') if article.get('author') else [],
+                'publish_date': article.get('date'),
+                'text': text,
+                'summary': text[:500] + '...' if len(text) > 500 else text,
+                'top_image': article.get('image'),
                 'scraped_at': datetime.now().isoformat()
             }
         except Exception as e:
@@ -82,7 +147,7 @@ class WebScraper:
 
     def scrape_with_beautifulsoup(self, url: str) -> Optional[dict]:
         """
-        Alternative scraping method using BeautifulSoup for more control.
+        Alternative scraping method using selectolax (Lexbor) for more control.
         
         Args:
             url: The URL to scrape
@@ -91,20 +156,19 @@ class WebScraper:
             Dictionary with page data or None if failed
         """
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'lxml')
+            tree = LexborHTMLParser(response.content)
             
             # Remove script and style elements
-            for element in soup(['script', 'style', 'nav', 'footer', 'header']):
-                element.decompose()
+            tree.strip_tags(['script', 'style', 'nav', 'footer', 'header'])
             
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else 'No title'
+            title = tree.css_first('title')
+            title_text = title.text().strip() if title else 'No title'
             
             # Try to find main content
-            main_content = soup.find('article') or soup.find('main') or soup.find('body')
-            text = main_content.get_text(separator='\n', strip=True) if main_content else ''
+            main_content = tree.css_first('article') or tree.css_first('main') or tree.body
+            text = main_content.text(separator='\n', strip=True) if main_content else ''
             
             # Clean up text
             text = re.sub(r'\n+', '\n', text)
@@ -128,46 +192,48 @@ class WebScraper:
         Args:
             topic: The topic to search and scrape
             num_results: Number of results to scrape
-            method: 'article' for newspaper3k or 'bs4' for BeautifulSoup
+            method: 'article' for trafilatura or 'bs4' for the selectolax parser
             
         Returns:
             List of scraped content dictionaries
         """
         urls = self.search_topic(topic, num_results)
         self.results = []
+        scrape = self.scrape_article if method == 'article' else self.scrape_with_beautifulsoup
         
-        for i, url in enumerate(urls, 1):
-            print(f"Scraping ({i}/{len(urls)}): {url}")
-            
-            if method == 'article':
-                data = self.scrape_article(url)
-            else:
-                data = self.scrape_with_beautifulsoup(url)
-            
-            if data:
-                data['topic'] = topic
-                self.results.append(data)
-            
-            time.sleep(self.delay)
+        # Search results are mostly on different hosts, so pages are fetched concurrently;
+        # map() keeps the results in search order
+        with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as executor:
+            for i, (url, data) in enumerate(zip(urls, executor.map(scrape, urls)), 1):
+                print(f"Scraped ({i}/{len(urls)}): {url}")
+                if data:
+                    data['topic'] = topic
+                    self.results.append(data)
         
         print(f"\nSuccessfully scraped {len(self.results)} pages")
         return self.results
 
     def save_to_json(self, filename: str = 'scraped_data.json'):
         """Save results to JSON file."""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(self.results, option=orjson.OPT_INDENT_2))
         print(f"Saved to {filename}")
 
     def save_to_csv(self, filename: str = 'scraped_data.csv'):
         """Save results to CSV file."""
         if self.results:
-            df = pd.DataFrame(self.results)
-            df.to_csv(filename, index=False, encoding='utf-8')
+            # Columns in first-seen order, as a DataFrame built from these dicts would have them
+            fieldnames = list(dict.fromkeys(key for row in self.results for key in row))
+            with open(filename, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+                writer.writeheader()
+                writer.writerows(self.results)
             print(f"Saved to {filename}")
 
-    def get_dataframe(self) -> pd.DataFrame:
+    def get_dataframe(self) -> 'pd.DataFrame':
         """Return results as a pandas DataFrame."""
+        # pandas is only imported by callers that want a DataFrame
+        import pandas as pd
         return pd.DataFrame(self.results)
 
 
@@ -3,10 +3,12 @@ Seed Known Cards with Category Rewards
 Uploads the curated cards.json data to Supabase with full category rewards.
 """
 
-import json
 import os
+import hashlib
+import orjson
 from dotenv import load_dotenv
 from supabase import create_client
+from credit_card_uploader import use_http2_session
 
 load_dotenv(override=True)
 
@@ -589,6 +591,33 @@ KNOWN_CARDS = [
     },
 ]
 
+# Columns copied from each catalog entry into its cards row
+CARD_FIELDS = (
+    'card_key', 'name', 'issuer', 'reward_program', 'reward_currency',
+    'point_valuation', 'annual_fee', 'base_reward_rate', 'base_reward_unit',
+)
+
+# Every entry gets both optional keys, so the upload code can index them directly
+for card in KNOWN_CARDS:
+    card.setdefault('category_rewards', [])
+    card.setdefault('signup_bonus', None)
+
+# One entry per card_key (last one wins); Postgres rejects an upsert that touches a row twice
+CARDS_BY_KEY = {card['card_key']: card for card in KNOWN_CARDS}
+
+
+def _card_row(card: dict) -> dict:
+    """Build a card's cards row, hashing everything seeded for it (row, category rewards, signup bonus)."""
+    row = {field: card[field] for field in CARD_FIELDS}
+    row['is_active'] = True
+    payload = orjson.dumps([row, card['category_rewards'], card['signup_bonus']])
+    row['content_hash'] = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    return row
+
+
+# The catalog is static, so its cards rows and their hashes are built once at import
+CARD_ROWS = [_card_row(card) for card in CARDS_BY_KEY.values()]
+
 
 def upload_known_cards():
     """Upload known cards with category rewards to Supabase."""
@@ -598,76 +627,37 @@ def upload_known_cards():
     if not url or not key:
         raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in .env")
     
-    client = create_client(url, key)
+    # The hash lookup and the seed call share one keep-alive connection
+    client = use_http2_session(create_client(url, key))
     
-    results = {'inserted': 0, 'updated': 0, 'category_rewards': 0, 'signup_bonuses': 0, 'errors': []}
+    results = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'category_rewards': 0, 'signup_bonuses': 0, 'errors': []}
     
-    for card in KNOWN_CARDS:
-        try:
-            # Prepare card data (without nested objects)
-            card_data = {
-                'card_key': card['card_key'],
-                'name': card['name'],
-                'issuer': card['issuer'],
-                'reward_program': card['reward_program'],
-                'reward_currency': card['reward_currency'],
-                'point_valuation': card['point_valuation'],
-                'annual_fee': card['annual_fee'],
-                'base_reward_rate': card['base_reward_rate'],
-                'base_reward_unit': card['base_reward_unit'],
-                'is_active': True,
-            }
-            
-            # Check if card exists
-            existing = client.table('cards').select('id').eq('card_key', card['card_key']).execute()
-            
-            if existing.data:
-                card_id = existing.data[0]['id']
-                client.table('cards').update(card_data).eq('id', card_id).execute()
-                results['updated'] += 1
-            else:
-                result = client.table('cards').insert(card_data).execute()
-                card_id = result.data[0]['id'] if result.data else None
-                results['inserted'] += 1
-            
-            if not card_id:
-                continue
-            
-            # Delete existing category rewards for this card
-            client.table('category_rewards').delete().eq('card_id', card_id).execute()
-            
-            # Insert category rewards
-            for cr in card.get('category_rewards', []):
-                cr_data = {
-                    'card_id': card_id,
-                    'category': cr['category'],
-                    'multiplier': cr['multiplier'],
-                    'reward_unit': cr['reward_unit'],
-                    'description': cr['description'],
-                }
-                client.table('category_rewards').insert(cr_data).execute()
-                results['category_rewards'] += 1
-            
-            # Delete existing signup bonuses for this card
-            client.table('signup_bonuses').delete().eq('card_id', card_id).execute()
-            
-            # Insert signup bonus if exists
-            if card.get('signup_bonus'):
-                sb = card['signup_bonus']
-                sb_data = {
-                    'card_id': card_id,
-                    'bonus_amount': sb['bonus_amount'],
-                    'bonus_currency': sb['bonus_currency'],
-                    'spend_requirement': sb['spend_requirement'],
-                    'timeframe_days': sb['timeframe_days'],
-                    'is_active': True,
-                }
-                client.table('signup_bonuses').insert(sb_data).execute()
-                results['signup_bonuses'] += 1
-                
-        except Exception as e:
-            results['errors'].append({'card': card['card_key'], 'error': str(e)})
+    try:
+        # Stored hashes tell unchanged cards apart
+        existing = client.table('cards').select('card_key, content_hash').in_('card_key', list(CARDS_BY_KEY)).execute()
+        existing_hashes = {row['card_key']: row['content_hash'] for row in existing.data}
+        
+        # Only write cards whose content changed since the last seed; an unchanged catalog stops here
+        rows = [row for row in CARD_ROWS if existing_hashes.get(row['card_key']) != row['content_hash']]
+        results['unchanged'] = len(CARD_ROWS) - len(rows)
+        if not rows:
+            return results
+        
+        # Cards, category rewards and signup bonuses go in one transaction (seed_cards() in schema.sql),
+        # so a failed run never stores a card's new hash without its rewards
+        payload = []
+        for row in rows:
+            card = CARDS_BY_KEY[row['card_key']]
+            payload.append({**row, 'category_rewards': card['category_rewards'], 'signup_bonus': card['signup_bonus'] or None})
+        seeded = client.rpc('seed_cards', {'payload': payload}).execute()
+    except Exception as e:
+        results['errors'].extend({'card': card_key, 'error': str(e)} for card_key in CARDS_BY_KEY)
+        return results
     
+    results['inserted'] = sum(1 for row in seeded.data if row['inserted'])
+    results['updated'] = len(seeded.data) - results['inserted']
+    results['category_rewards'] = sum(len(card['category_rewards']) for card in payload)
+    results['signup_bonuses'] = sum(1 for card in payload if card['signup_bonus'])
     return results
 
 
@@ -681,6 +671,7 @@ def main():
     print(f"\nResults:")
     print(f"  Cards inserted: {result['inserted']}")
     print(f"  Cards updated: {result['updated']}")
+    print(f"  Cards unchanged: {result['unchanged']}")
     print(f"  Category rewards: {result['category_rewards']}")
     print(f"  Signup bonuses: {result['signup_bonuses']}")
     
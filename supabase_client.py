@@ -6,9 +6,32 @@ import os
 from supabase import create_client, Client
 from dotenv import load_dotenv
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from credit_card_uploader import UPLOAD_WORKERS, use_http2_session
 
 load_dotenv()
 
+# Articles per insert request; full article text makes rows large, so batches stay small
+UPLOAD_BATCH_SIZE = 50
+# Rows per page when reading stored URLs
+PAGE_SIZE = 1000
+
+
+def _clean_article(article: dict) -> dict:
+    """Build the scraped_articles row for one article, joining an authors list into a string."""
+    authors = article.get('authors')
+    return {
+        'url': article.get('url'),
+        'title': article.get('title'),
+        'authors': ', '.join(authors) if isinstance(authors, list) else authors,
+        'publish_date': article.get('publish_date'),
+        'text': article.get('text'),
+        'summary': article.get('summary'),
+        'top_image': article.get('top_image'),
+        'topic': article.get('topic'),
+        'scraped_at': article.get('scraped_at'),
+    }
+
 
 class SupabaseUploader:
     """Handles uploading scraped data to Supabase."""
@@ -31,44 +54,60 @@ class SupabaseUploader:
             )
         
         self.client: Client = create_client(self.url, self.key)
+        # Batched uploads reuse one keep-alive HTTP/2 connection instead of reconnecting per request
+        use_http2_session(self.client)
 
-    def upload_articles(self, articles: list[dict], table_name: str = 'scraped_articles') -> dict:
+    def upload_articles(self, articles: list[dict], table_name: str = 'scraped_articles', skip_existing: bool = False) -> dict:
         """
         Upload scraped articles to Supabase.
         
         Args:
             articles: List of article dictionaries from the scraper
             table_name: Name of the Supabase table
+            skip_existing: Skip articles whose URL is already stored instead of failing the insert
             
         Returns:
-            Response from Supabase
+            Summary of upload results
         """
         if not articles:
             return {'error': 'No articles to upload'}
         
         # Clean data for Supabase (convert lists to strings, handle None values)
-        cleaned_articles = []
-        for article in articles:
-            cleaned = {
-                'url': article.get('url'),
-                'title': article.get('title'),
-                'authors': ', '.join(article.get('authors', [])) if isinstance(article.get('authors'), list) else article.get('authors'),
-                'publish_date': article.get('publish_date'),
-                'text': article.get('text'),
-                'summary': article.get('summary'),
-                'top_image': article.get('top_image'),
-                'topic': article.get('topic'),
-                'scraped_at': article.get('scraped_at')
-            }
-            cleaned_articles.append(cleaned)
+        cleaned_articles = [_clean_article(article) for article in articles]
         
-        try:
-            response = self.client.table(table_name).insert(cleaned_articles).execute()
-            print(f"Successfully uploaded {len(cleaned_articles)} articles to '{table_name}'")
-            return {'success': True, 'count': len(cleaned_articles), 'data': response.data}
-        except Exception as e:
-            print(f"Upload failed: {e}")
-            return {'success': False, 'error': str(e)}
+        # Batches keep each request under PostgREST's body size and statement timeout; they are
+        # independent, so they upload concurrently (capped to the session's connection pool)
+        # and a failed batch doesn't sink the rest
+        count = 0
+        errors = []
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+            uploads = [
+                executor.submit(self._upload_batch, cleaned_articles[i:i + UPLOAD_BATCH_SIZE], table_name, skip_existing)
+                for i in range(0, len(cleaned_articles), UPLOAD_BATCH_SIZE)
+            ]
+            for future in uploads:
+                try:
+                    count += future.result()
+                except Exception as e:
+                    errors.append(str(e))
+        
+        if errors:
+            print(f"Upload failed for {len(errors)} of {len(uploads)} batches ({count} articles uploaded): {errors[0]}")
+            return {'success': False, 'count': count, 'error': errors[0]}
+        print(f"Successfully uploaded {count} articles to '{table_name}'")
+        return {'success': True, 'count': count}
+
+    def _upload_batch(self, batch: list[dict], table_name: str, skip_existing: bool) -> int:
+        """Insert one batch of cleaned articles and return how many were added; no rows are echoed back."""
+        if skip_existing:
+            # ON CONFLICT (url) DO NOTHING; PostgREST counts only the rows it inserted
+            response = self.client.table(table_name).upsert(
+                batch, on_conflict='url', ignore_duplicates=True, count='exact', returning='minimal'
+            ).execute()
+            # No Content-Range header (some proxies strip it) leaves count unset; report the batch size
+            return response.count if response.count is not None else len(batch)
+        self.client.table(table_name).insert(batch, returning='minimal').execute()
+        return len(batch)
 
     def upload_single(self, article: dict, table_name: str = 'scraped_articles') -> dict:
         """Upload a single article to Supabase."""
@@ -77,20 +116,38 @@ class SupabaseUploader:
     def get_existing_urls(self, table_name: str = 'scraped_articles') -> set:
         """Get all existing URLs to avoid duplicates."""
         try:
-            response = self.client.table(table_name).select('url').execute()
-            return {item['url'] for item in response.data}
+            # One page at a time so memory stays bounded and PostgREST's max-rows cap can't truncate the set
+            urls = set()
+            offset = 0
+            while True:
+                page = (
+                    self.client.table(table_name).select('url')
+                    .order('id').range(offset, offset + PAGE_SIZE - 1).execute()
+                )
+                urls.update(item['url'] for item in page.data)
+                if len(page.data) < PAGE_SIZE:
+                    return urls
+                offset += PAGE_SIZE
         except Exception as e:
             print(f"Failed to fetch existing URLs: {e}")
             return set()
 
     def upload_new_only(self, articles: list[dict], table_name: str = 'scraped_articles') -> dict:
         """Upload only articles that don't already exist in the database."""
-        existing_urls = self.get_existing_urls(table_name)
-        new_articles = [a for a in articles if a.get('url') not in existing_urls]
+        if not articles:
+            print("No articles to upload")
+            return {'success': True, 'count': 0, 'skipped': 0, 'duplicates': 0}
         
-        if not new_articles:
-            print("No new articles to upload (all already exist)")
-            return {'success': True, 'count': 0, 'skipped': len(articles)}
+        # A URL scraped more than once in this run is sent once, as its last copy
+        unique_articles = list({article.get('url'): article for article in articles}.values())
+        duplicates = len(articles) - len(unique_articles)
+        if duplicates:
+            print(f"Dropped {duplicates} repeated URLs from this batch")
         
-        print(f"Uploading {len(new_articles)} new articles (skipping {len(articles) - len(new_articles)} duplicates)")
-        return self.upload_articles(new_articles, table_name)
+        # The unique url constraint skips stored articles in the same requests that insert the new ones
+        result = self.upload_articles(unique_articles, table_name, skip_existing=True)
+        result['duplicates'] = duplicates
+        if result['success']:
+            result['skipped'] = len(unique_articles) - result['count']
+            print(f"Skipped {result['skipped']} articles that already exist")
+        return result
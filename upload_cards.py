@@ -5,6 +5,7 @@ Non-interactive script for automated uploads.
 
 import sys
 import os
+from collections import Counter
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -41,10 +42,8 @@ def main():
     # Display summary
     print(f"\nLoaded {len(cards)} cards")
     print("\nCards by issuer:")
-    issuers = {}
-    for card in cards:
-        issuers[card.issuer] = issuers.get(card.issuer, 0) + 1
-    for issuer, count in sorted(issuers.items(), key=lambda x: -x[1]):
+    issuers = Counter(card.issuer for card in cards)
+    for issuer, count in issuers.most_common():
         print(f"  {issuer}: {count}")
     
     # Upload to Supabase
@@ -57,6 +56,7 @@ def main():
         print("Upload Results:")
         print(f"  Cards inserted: {result['cards_inserted']}")
         print(f"  Cards updated: {result['cards_updated']}")
+        print(f"  Cards unchanged: {result['cards_unchanged']}")
         print(f"  Category rewards: {result['category_rewards_inserted']}")
         print(f"  Signup bonuses: {result['signup_bonuses_inserted']}")
         